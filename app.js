@@ -9,7 +9,24 @@ class AIModelsDashboard {
         // CSV URLs
         this.csvUrl = 'https://ppl-ai-code-interpreter-files.s3.amazonaws.com/web/direct-files/a7121802c215fa8257dae6657eb87e5e/e68df3ef-184b-4b6e-91c1-4a11640f6c98/24bbc652.csv';
         this.headersUrl = 'https://ppl-ai-code-interpreter-files.s3.amazonaws.com/web/direct-files/a7121802c215fa8257dae6657eb87e5e/e68df3ef-184b-4b6e-91c1-4a11640f6c98/f5ce0f92.csv';
-        this.lastUpdatedUrl = 'https://ppl-ai-code-interpreter-files.s3.amazonaws.com/web/direct-files/a7121802c215fa8257dae6657eb87e5e/e68df3ef-184b-4b6e-91c1-4a11640f6c98/77d148a5.txt';
+        this.remoteLastUpdatedUrl = 'https://ppl-ai-code-interpreter-files.s3.amazonaws.com/web/direct-files/a7121802c215fa8257dae6657eb87e5e/e68df3ef-184b-4b6e-91c1-4a11640f6c98/77d148a5.txt';
+        // Same origin as stats.json, shards/ and search_index.json, which are stamped with it
+        this.lastUpdatedUrl = 'last-updated.txt';
+        // The published event log, headerless, with its header in a separate file
+        this.localCsvUrl = 'model_list.csv';
+        this.localHeadersUrl = 'model_list_headers.csv';
+        // Aggregates precomputed by script.py --stats (optional)
+        this.statsUrl = 'stats.json';
+        this.stats = null;
+        // Pre-sorted views and shards written by script.py --shards (optional)
+        this.shardsBase = 'shards/';
+        this.manifest = null;
+        this.shardCache = new Map();
+        // Trigram search index written by script.py --search-index (optional)
+        this.searchIndexUrl = 'search_index.json';
+        this.varintDigits = new Map([...'0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz-_']
+            .map((char, digit) => [char, digit]));
+        this.searchIndex = null;
         
         this.init();
     }
@@ -70,18 +87,46 @@ class AIModelsDashboard {
 
     async loadData() {
         try {
-            const [csvData, lastUpdated] = await Promise.all([
-                fetch(this.csvUrl).then(r => r.text()),
-                fetch(this.lastUpdatedUrl).then(r => r.text()).catch(() => new Date().toISOString())
+            const [lastUpdated, stats, manifest] = await Promise.all([
+                fetch(this.lastUpdatedUrl).then(r => r.ok ? r.text() : Promise.reject())
+                    .then(text => ({ text, local: true }))
+                    .catch(() => fetch(this.remoteLastUpdatedUrl).then(r => r.text()).then(text => ({ text, local: false })))
+                    .catch(() => ({ text: new Date().toISOString(), local: false })),
+                fetch(this.statsUrl).then(r => r.ok ? r.json() : null).catch(() => null),
+                fetch(this.shardsBase + 'manifest.json').then(r => r.ok ? r.json() : null).catch(() => null)
             ]);
+            // Not needed for first paint, so it loads in the background
+            const searchIndex = fetch(this.searchIndexUrl).then(r => r.ok ? r.json() : null).catch(() => null);
+
+            // Only trust precomputed outputs built from the same data version, and only when the
+            // rows come from the same origin as well
+            const version = lastUpdated.text.trim();
+            const current = output => lastUpdated.local && output && output.version === version ? output : null;
+            this.stats = current(stats);
+            this.manifest = current(manifest);
+
+            // The default view arrives already sorted, so no client-side sort is needed
+            const defaultView = this.manifest && this.manifest.views[this.manifest.default_view];
+            const csvData = defaultView ? await fetch(this.shardsBase + defaultView.path).then(r => r.text())
+                : lastUpdated.local ? await this.loadLocalCSV() : await fetch(this.csvUrl).then(r => r.text());
+            if (defaultView) {
+                this.currentSort = {
+                    column: defaultView.order[0],
+                    direction: defaultView.descending ? 'desc' : 'asc'
+                };
+            }
 
             this.models = this.parseCSV(csvData);
             this.processModels();
-            this.updateLastUpdated(lastUpdated.trim());
+            this.updateLastUpdated(version);
             this.setupFilters();
             this.renderTable();
-            this.updateStatistics();
+            this.updateStatistics(this.stats);
             this.renderProviderTags();
+            this.updateSortIndicators();
+            searchIndex.then(index => {
+                if (current(index)) this.prepareSearchIndex(index);
+            });
             
             // Hide loading state
             document.getElementById('loadingState').style.display = 'none';
@@ -92,6 +137,16 @@ class AIModelsDashboard {
         }
     }
 
+    async loadLocalCSV() {
+        const [csvData, headers] = await Promise.all([
+            fetch(this.localCsvUrl).then(r => r.ok ? r.text() : Promise.reject(new Error(`Failed to load ${this.localCsvUrl}`))),
+            fetch(this.localHeadersUrl).then(r => r.ok ? r.text() : '').catch(() => '')
+        ]);
+        // The log has no header row of its own; parseCSV() expects one
+        const header = headers.split('\n')[0].trim();
+        return header && csvData.split('\n')[0].trim() !== header ? `${header}\n${csvData}` : csvData;
+    }
+
     parseCSV(csv) {
         const lines = csv.trim().split('\n');
         const headers = lines[0].split(',').map(h => h.trim().replace(/"/g, ''));
@@ -104,8 +159,8 @@ class AIModelsDashboard {
                 let value = values[index] || '';
                 
                 // Convert specific fields
-                if (header === 'context_length' || header === 'cost_per_1k_tokens') {
-                    value = parseFloat(value) || 0;
+                if (header === 'context_length' || header === 'cost_per_1k_tokens' || header === 'parameter_count') {
+                    value = this.parseNumber(value);
                 } else if (header === 'release_date') {
                     value = value || '1970-01-01';
                 }
@@ -117,6 +172,12 @@ class AIModelsDashboard {
         }).filter(model => model.model_name); // Filter out empty rows
     }
 
+    parseNumber(value) {
+        // Empty or unparseable cells are unknown (null), not zero
+        const number = parseFloat(value);
+        return Number.isFinite(number) ? number : null;
+    }
+
     parseCSVLine(line) {
         const result = [];
         let current = '';
@@ -141,15 +202,15 @@ class AIModelsDashboard {
 
     processModels() {
         this.models.forEach(model => {
-            // Extract AI provider from model name
-            model.ai_tab = this.extractProvider(model.model_name);
+            // Use the provider classified by script.py, extracting it only for older CSVs
+            model.ai_tab = model.ai_tab || this.extractProvider(model.model_name, model.source);
             this.providers.add(model.source);
         });
         
         this.filteredModels = [...this.models];
     }
 
-    extractProvider(modelName) {
+    extractProvider(modelName, source) {
         const name = modelName.toLowerCase();
         
         if (name.includes('gpt') || name.includes('chatgpt')) return 'GPT';
@@ -163,7 +224,7 @@ class AIModelsDashboard {
         if (name.includes('palm')) return 'PaLM';
         
         // Fallback to source
-        return this.models.find(m => m.model_name === modelName)?.source || 'Other';
+        return source || 'Other';
     }
 
     updateLastUpdated(dateString) {
@@ -197,8 +258,65 @@ class AIModelsDashboard {
         this.applyFilters();
     }
 
-    handleFilterChange() {
-        this.applyFilters();
+    async handleFilterChange() {
+        const shard = this.getShardForFilters();
+        if (!shard) {
+            this.applyFilters();
+            return;
+        }
+
+        // A lone source/status filter maps to one pre-sorted shard file: no scan, no sort
+        let models;
+        try {
+            models = await this.loadShard(shard.path);
+        } catch (error) {
+            console.error('Error loading shard:', error);
+            if (this.getShardForFilters()?.path === shard.path) this.applyFilters();
+            return;
+        }
+        // Filters, search or sort may have changed while the shard loaded; a newer render wins
+        if (this.getShardForFilters()?.path !== shard.path) return;
+        this.filteredModels = models;
+        this.updateActiveFilters();
+        this.renderTable();
+        this.updateStatistics();
+    }
+
+    getShardForFilters() {
+        if (!this.manifest || document.getElementById('searchInput').value ||
+            document.getElementById('dateFromFilter').value || document.getElementById('dateToFilter').value) {
+            return null;
+        }
+
+        // Shards are stored in the default view's order
+        const defaultView = this.manifest.views[this.manifest.default_view];
+        const direction = defaultView.descending ? 'desc' : 'asc';
+        if (this.currentSort.column !== defaultView.order[0] || this.currentSort.direction !== direction) {
+            return null;
+        }
+
+        const status = document.getElementById('statusFilter').value;
+        const source = document.getElementById('sourceFilter').value;
+        if (status !== 'all' && source !== 'all') return null;
+        if (status !== 'all') return this.manifest.shards.status?.[status] || null;
+        if (source !== 'all') return this.manifest.shards.source?.[source] || null;
+        return null;
+    }
+
+    async loadShard(path) {
+        if (!this.shardCache.has(path)) {
+            const csvData = await fetch(this.shardsBase + path).then(r => {
+                if (!r.ok) throw new Error(`Failed to load ${path}`);
+                return r.text();
+            });
+            const models = this.parseCSV(csvData);
+            models.forEach(model => {
+                model.ai_tab = model.ai_tab || this.extractProvider(model.model_name, model.source);
+            });
+            this.shardCache.set(path, models);
+        }
+        // Copy, since sortTable() sorts filteredModels in place
+        return [...this.shardCache.get(path)];
     }
 
     applyFilters() {
@@ -208,19 +326,12 @@ class AIModelsDashboard {
         const dateFrom = document.getElementById('dateFromFilter').value;
         const dateTo = document.getElementById('dateToFilter').value;
 
-        this.filteredModels = this.models.filter(model => {
+        // Index lookup when possible; otherwise scan every row
+        const indexed = searchTerm ? this.searchWithIndex(searchTerm) : null;
+
+        this.filteredModels = (indexed || this.models).filter(model => {
             // Search filter
-            if (searchTerm) {
-                const searchFields = [
-                    model.model_name,
-                    model.source,
-                    model.ai_tab,
-                    model.status,
-                    model.parameters
-                ].join(' ').toLowerCase();
-                
-                if (!searchFields.includes(searchTerm)) return false;
-            }
+            if (searchTerm && !indexed && !this.getSearchText(model).includes(searchTerm)) return false;
 
             // Status filter
             if (statusFilter !== 'all' && model.status !== statusFilter) return false;
@@ -240,6 +351,118 @@ class AIModelsDashboard {
         this.updateStatistics();
     }
 
+    getSearchText(model) {
+        // Must match SEARCH_FIELDS in search_index.py
+        return [
+            model.model_name,
+            model.source,
+            model.ai_tab,
+            model.status,
+            model.parameters,
+            model.comments
+        ].join(' ').toLowerCase();
+    }
+
+    crc32(text) {
+        // Same as text_key() in search_index.py: CRC-32 of the UTF-8 bytes
+        if (!this.crcTable) {
+            this.crcTable = new Int32Array(256).map((_, n) => {
+                for (let k = 0; k < 8; k++) n = n & 1 ? 0xEDB88320 ^ (n >>> 1) : n >>> 1;
+                return n;
+            });
+            this.textEncoder = new TextEncoder();
+        }
+        let crc = -1;
+        for (const byte of this.textEncoder.encode(text)) crc = (crc >>> 8) ^ this.crcTable[(crc ^ byte) & 0xff];
+        return (crc ^ -1) >>> 0;
+    }
+
+    prepareSearchIndex(index) {
+        // Keys shared by several docs can't name one doc, so their rows are checked directly
+        const docIds = new Map();
+        const shared = new Set();
+        index.keys.forEach((key, id) => {
+            if (docIds.has(key)) shared.add(key);
+            docIds.set(key, id);
+        });
+        const docModels = new Map();
+        const unindexed = [];
+
+        this.models.forEach((model, position) => {
+            model._position = position;
+            const key = this.crc32(this.getSearchText(model));
+            const id = shared.has(key) ? undefined : docIds.get(key);
+            if (id === undefined) {
+                // Text differs from what the generator saw; always check these directly
+                unindexed.push(model);
+            } else if (docModels.has(id)) {
+                docModels.get(id).push(model);
+            } else {
+                docModels.set(id, [model]);
+            }
+        });
+
+        this.searchIndex = { trigrams: index.trigrams, postings: new Map(), docModels, unindexed };
+    }
+
+    getPostings(gram) {
+        const index = this.searchIndex;
+        if (!index.postings.has(gram)) {
+            // Base-32 varints of the gaps between ids (pack_postings() in search_index.py)
+            const packed = index.trigrams[gram] || '';
+            const ids = [];
+            let id = 0, value = 0;
+            for (const char of packed) {
+                const digit = this.varintDigits.get(char);
+                value = value * 32 + (digit & 31);
+                if (digit < 32) {
+                    id += value;
+                    ids.push(id);
+                    value = 0;
+                }
+            }
+            index.postings.set(gram, ids);
+        }
+        return index.postings.get(gram);
+    }
+
+    searchWithIndex(term) {
+        // Trigrams need three characters; astral characters split differently in JS and Python
+        if (!this.searchIndex || term.length < 3 || /[\uD800-\uDFFF]/.test(term)) return null;
+
+        const grams = new Set();
+        for (let i = 0; i + 3 <= term.length; i++) grams.add(term.slice(i, i + 3));
+        const lists = [...grams].map(gram => this.getPostings(gram)).sort((a, b) => a.length - b.length);
+
+        // Intersect sorted posting lists, shortest first
+        let candidates = lists[0];
+        for (const list of lists.slice(1)) {
+            if (candidates.length === 0) break;
+            const next = [];
+            let j = 0;
+            for (const id of candidates) {
+                while (j < list.length && list[j] < id) j++;
+                if (j < list.length && list[j] === id) next.push(id);
+            }
+            candidates = next;
+        }
+
+        const { docModels, unindexed } = this.searchIndex;
+        const results = [];
+        candidates.forEach(id => {
+            // Trigrams can all match without the term itself; confirm on the row's own text
+            (docModels.get(id) || []).forEach(model => {
+                if (this.getSearchText(model).includes(term)) results.push(model);
+            });
+        });
+        unindexed.forEach(model => {
+            if (this.getSearchText(model).includes(term)) results.push(model);
+        });
+
+        // Keep the same order a full scan would give
+        return results.sort((a, b) => a._position - b._position);
+    }
+
     updateActiveFilters() {
         const activeFilters = [];
         const searchTerm = document.getElementById('searchInput').value;
@@ -329,9 +552,16 @@ class AIModelsDashboard {
             let bVal = b[column];
 
             // Handle different data types
-            if (column === 'cost_per_1k_tokens' || column === 'context_length') {
-                aVal = parseFloat(aVal) || 0;
-                bVal = parseFloat(bVal) || 0;
+            // Parameters sort by their parsed count when the CSV has one
+            if (column === 'cost_per_1k_tokens' || column === 'context_length' ||
+                (column === 'parameters' && 'parameter_count' in a)) {
+                const key = column === 'parameters' ? 'parameter_count' : column;
+                aVal = a[key];
+                bVal = b[key];
+                // Unknown values sort last in either direction
+                if (aVal == null || bVal == null) {
+                    return (aVal == null) - (bVal == null);
+                }
             } else if (column === 'release_date') {
                 aVal = new Date(aVal);
                 bVal = new Date(bVal);
@@ -380,7 +610,7 @@ class AIModelsDashboard {
                 <td><span class="release-date">${this.formatDate(model.release_date)}</span></td>
                 <td><span class="parameters">${this.escapeHtml(model.parameters)}</span></td>
                 <td><span class="context-length">${this.formatNumber(model.context_length)}</span></td>
-                <td><span class="cost-cell">$${this.formatCost(model.cost_per_1k_tokens)}</span></td>
+                <td><span class="cost-cell">${this.formatCost(model.cost_per_1k_tokens)}</span></td>
             `;
             tbody.appendChild(row);
         });
@@ -416,15 +646,24 @@ class AIModelsDashboard {
     }
 
     formatCost(cost) {
-        if (!cost || cost === 0) return '0.00';
-        return cost.toFixed(4);
+        if (cost == null) return '-';
+        return `$${cost.toFixed(4)}`;
     }
 
-    updateStatistics() {
+    updateStatistics(stats = null) {
+        if (stats) {
+            document.getElementById('totalModels').textContent = stats.total;
+            document.getElementById('availableModels').textContent = stats.available;
+            document.getElementById('avgCost').textContent = this.formatCost(stats.avg_cost);
+            document.getElementById('topProvider').textContent = stats.top_source;
+            return;
+        }
+
         const total = this.filteredModels.length;
         const available = this.filteredModels.filter(m => m.status === 'Available').length;
-        const avgCost = total > 0 ? 
-            this.filteredModels.reduce((sum, m) => sum + (parseFloat(m.cost_per_1k_tokens) || 0), 0) / total : 0;
+        const prices = this.filteredModels.map(m => m.cost_per_1k_tokens).filter(cost => cost != null);
+        const avgCost = prices.length > 0 ?
+            prices.reduce((sum, cost) => sum + cost, 0) / prices.length : null;
         
         // Calculate top provider
         const providerCounts = {};
@@ -436,13 +675,15 @@ class AIModelsDashboard {
 
         document.getElementById('totalModels').textContent = total;
         document.getElementById('availableModels').textContent = available;
-        document.getElementById('avgCost').textContent = `$${avgCost.toFixed(4)}`;
+        document.getElementById('avgCost').textContent = this.formatCost(avgCost);
         document.getElementById('topProvider').textContent = topProvider;
     }
 
     renderProviderTags() {
         const container = document.getElementById('providerTags');
-        const uniqueProviders = [...new Set(this.models.map(m => m.ai_tab))].sort();
+        const uniqueProviders = this.stats ?
+            Object.keys(this.stats.by_provider).sort() :
+            [...new Set(this.models.map(m => m.ai_tab))].sort();
 
         container.innerHTML = '';
         uniqueProviders.forEach(provider => {
@@ -0,0 +1,143 @@
+"""Point-in-time queries over the model_list.csv event log.
+
+The Added/Removed events of each model and feed are folded into sorted,
+non-overlapping live intervals [added, removed). Asking which models were
+live at time T is then one binary search per model instead of a replay of
+the whole log.
+
+A model whose first event is Removed was live before the log began. Its
+snapshot row is synthetic: status Available with blank date, time and
+comments, since the log has no row describing it while it was live.
+
+    python asof.py "2025-06-12 20:00"                  # snapshot CSV on stdout
+    python asof.py 2025-06-12 -o snapshot.csv --with-header
+"""
+import argparse
+import csv
+import sys
+from bisect import bisect_right
+from datetime import datetime
+
+from csv_reader import iter_rows, read_header
+
+STAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def parse_stamp(value):
+    # Accepts a date or any ISO date-time; normalised so stamps compare as strings
+    return datetime.fromisoformat(value).strftime(STAMP_FORMAT)
+
+
+class IntervalIndex:
+    """Live intervals per (model_name, source), built from event rows."""
+
+    def __init__(self, header):
+        self.header = list(header)
+        self.column = {name: i for i, name in enumerate(self.header)}
+        missing = [c for c in ("model_name", "source", "date", "time", "status") if c not in self.column]
+        if missing:
+            raise ValueError(f"header has no {', '.join(missing)} column(s); as-of queries need the event log")
+        self.starts = {}
+        self.ends = {}
+        self.rows = {}
+
+    @classmethod
+    def from_csv(cls, path, header):
+        events = []
+        first = True
+        for _, row in iter_rows(path):
+            if first:
+                first = False
+                if row == list(header):
+                    continue
+            if len(row) == len(header):
+                events.append(row)
+        index = cls(header)
+        index.build(events)
+        return index
+
+    def _stamp(self, row):
+        return parse_stamp(f"{row[self.column['date']]} {row[self.column['time']]}")
+
+    def build(self, events):
+        # Fold each key's events in time order; ties keep file order
+        name, source, status = (self.column[c] for c in ("model_name", "source", "status"))
+        timeline = sorted(((self._stamp(row), i, row) for i, row in enumerate(events)), key=lambda e: e[:2])
+        for stamp, _, row in timeline:
+            key = (row[name], row[source])
+            starts = self.starts.setdefault(key, [])
+            ends = self.ends.setdefault(key, [])
+            rows = self.rows.setdefault(key, [])
+            is_open = bool(ends) and ends[-1] is None
+            if row[status] == "Added" and not is_open:
+                starts.append(stamp)
+                ends.append(None)
+                rows.append(row)
+            elif row[status] == "Removed":
+                if is_open:
+                    ends[-1] = stamp
+                elif not starts:
+                    # Removed before any Added: live since before the log began
+                    starts.append("")
+                    ends.append(stamp)
+                    rows.append(self._before_log(row))
+
+    def _before_log(self, removed):
+        # Stand-in opening row for a model that was already live when the log began
+        row = [""] * len(self.header)
+        for name in ("model_name", "source"):
+            row[self.column[name]] = removed[self.column[name]]
+        row[self.column["status"]] = "Available"
+        return row
+
+    def live_row(self, key, stamp):
+        """Return the row that opened key's interval containing stamp, or None."""
+        starts = self.starts.get(key)
+        if not starts:
+            return None
+        i = bisect_right(starts, stamp) - 1
+        if i < 0:
+            return None
+        end = self.ends[key][i]
+        return self.rows[key][i] if end is None or stamp < end else None
+
+    def as_of(self, when):
+        """Yield the opening row of every model and feed live at when, sorted by key."""
+        stamp = parse_stamp(when)
+        for key in sorted(self.starts):
+            row = self.live_row(key, stamp)
+            if row is not None:
+                yield row
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="List the models live at a point in time")
+    parser.add_argument("when", help="ISO date or date-time, e.g. '2025-06-12 20:00'")
+    parser.add_argument("--csv", default="model_list.csv")
+    parser.add_argument("--headers", default="model_list_headers.csv",
+                        help="CSV whose first row is the event log header")
+    parser.add_argument("-o", "--output", help="snapshot CSV path (default: stdout)")
+    parser.add_argument("--with-header", action="store_true", help="start the snapshot with the header row")
+    args = parser.parse_args(argv)
+
+    try:
+        parse_stamp(args.when)
+    except ValueError:
+        parser.error(f"invalid date or date-time {args.when!r}")
+
+    header = read_header(args.headers)
+    index = IntervalIndex.from_csv(args.csv, header)
+    out = open(args.output, "w", newline="", encoding="utf-8") if args.output else sys.stdout
+    try:
+        writer = csv.writer(out, lineterminator="\n")
+        if args.with_header:
+            writer.writerow(header)
+        writer.writerows(index.as_of(args.when))
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+"""Benchmark the data pipeline on synthetic catalogues of increasing size.
+
+For each size this times synthetic generation, the streaming CSV write,
+validation, aggregate computation and chart rendering, then stores the
+results as JSON together with the current commit so runs can be compared.
+
+    python benchmark.py --sizes 1000 100000 10000000 -o bench_results.json
+    python benchmark.py --sizes 1000 100000 --compare bench_results.json
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import pandas as pd
+
+import script
+from csv_reader import read_frame
+from stats import StatsBuilder
+from synthetic import generate_catalogue
+from validate_csv import validate
+
+DEFAULT_SIZES = [1_000, 100_000, 10_000_000]
+STAGES = ["generate", "csv_write", "validate", "aggregate", "chart"]
+
+
+def _commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def _render_chart(stats, path):
+    # Plotly, Kaleido and Chrome are optional; the stage is recorded as null without them
+    try:
+        import plotly.graph_objects as go
+
+        from chart_render import render_batch
+    except ImportError as e:
+        print(f"Chart stage skipped: {e}", file=sys.stderr)
+        return False
+    by_source = stats["by_source"]
+    fig = go.Figure(go.Bar(x=list(by_source), y=list(by_source.values())))
+    fig.update_layout(title="Models per source")
+    try:
+        # The same batch renderer the chart scripts use, without the cache so every run renders
+        render_batch([(fig, path)], workers=1)
+    except RuntimeError as e:
+        print(f"Chart stage skipped: {e}", file=sys.stderr)
+        return False
+    return True
+
+
+def run_size(rows, workdir, chunk_size, seed=0):
+    timings = {}
+    csv_path = os.path.join(workdir, f"bench_{rows}.csv")
+    header = list(script.headers_data)
+
+    timings["generate"], _ = _timed(lambda: sum(1 for _ in generate_catalogue(rows, seed)))
+    timings["csv_write"], _ = _timed(
+        lambda: script.write_csv_streaming(generate_catalogue(rows, seed), csv_path, chunk_size))
+    timings["validate"], errors = _timed(lambda: sum(1 for _ in validate(csv_path, header)))
+
+    def aggregate():
+        builder = StatsBuilder(os.path.join(workdir, "stats.json"), "benchmark")
+        for chunk in read_frame(csv_path, chunksize=chunk_size):
+            builder.write(chunk)
+        return builder.result()
+
+    timings["aggregate"], stats = _timed(aggregate)
+    chart_time, rendered = _timed(lambda: _render_chart(stats, os.path.join(workdir, "chart.png")))
+    timings["chart"] = chart_time if rendered else None
+
+    return {
+        "rows": rows,
+        "validation_errors": errors,
+        "csv_bytes": os.path.getsize(csv_path),
+        "seconds": timings,
+        "rows_per_second": {stage: rows / t for stage, t in timings.items() if t},
+    }
+
+
+def compare(results, baseline):
+    # Print the change in time per stage against a previous results file
+    previous = {entry["rows"]: entry for entry in baseline["results"]}
+    print(f"\nCompared with {baseline.get('commit') or 'baseline'}:")
+    for entry in results["results"]:
+        old = previous.get(entry["rows"])
+        if old is None:
+            continue
+        for stage in STAGES:
+            new_t, old_t = entry["seconds"].get(stage), old["seconds"].get(stage)
+            if new_t and old_t:
+                print(f"  {entry['rows']:>10} {stage:<10} {old_t:8.3f}s -> {new_t:8.3f}s "
+                      f"({(new_t - old_t) / old_t:+.1%})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the model_list.csv pipeline")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--chunk-size", type=int, default=script.DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", default="bench_results.json")
+    parser.add_argument("--compare", metavar="PATH", help="previous results file to compare against")
+    args = parser.parse_args(argv)
+
+    results = {
+        "commit": _commit(),
+        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "chunk_size": args.chunk_size,
+        "results": [],
+    }
+    with tempfile.TemporaryDirectory() as workdir:
+        for rows in args.sizes:
+            entry = run_size(rows, workdir, args.chunk_size, args.seed)
+            results["results"].append(entry)
+            stages = ", ".join(f"{stage} {t:.3f}s" if t is not None else f"{stage} skipped"
+                               for stage, t in entry["seconds"].items())
+            print(f"{rows:>10} rows: {stages}")
+    # ru_maxrss is in KiB on Linux
+    results["peak_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.output} (peak RSS {results['peak_rss_mb']:.0f} MB)")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(results, json.load(f))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,187 @@
+"""Assemble a minimal, pre-compressed dist/ for GitHub Pages.
+
+Only index.html, the assets it references and the data files app.js
+fetches are copied. Every text file above a small size gets .gz and, when
+the brotli module is installed, .br variants next to it, for hosts and
+CDNs that serve pre-encoded files. The chart PNGs are recompressed
+losslessly in place beforehand; they are documentation, not part of the
+site.
+
+    python build_dist.py                 # writes dist/
+    python build_dist.py --no-png -o site
+"""
+import argparse
+import glob
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+import struct
+import sys
+import zlib
+
+try:
+    import brotli
+except ImportError:  # optional dependency, only needed for .br variants
+    brotli = None
+
+# Files app.js fetches with relative URLs; missing optional outputs are skipped
+DATA_FILES = ["model_list.csv", "model_list_headers.csv", "last-updated.txt",
+              "stats.json", "search_index.json", "shards"]
+COMPRESSIBLE = {".csv", ".json", ".txt", ".html", ".css", ".js", ".svg"}
+# Below this the encoding overhead outweighs the saving
+MIN_COMPRESS_BYTES = 512
+CHART_CACHE = "chart_cache.json"
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# Chunks that affect how the image renders; everything else is metadata
+PNG_KEEP = {b"IHDR", b"PLTE", b"tRNS", b"gAMA", b"cHRM", b"sRGB", b"iCCP", b"sBIT", b"pHYs", b"IEND"}
+
+
+def referenced_assets(html_path):
+    # Local files referenced by src= and href= in the page
+    with open(html_path, encoding="utf-8") as f:
+        html = f.read()
+    refs = re.findall(r'(?:src|href)=["\']([^"\'#?]+)', html)
+    return [ref for ref in refs if not re.match(r"^(?:[a-z]+:|//)", ref)]
+
+
+def site_files(root="."):
+    files = ["index.html"] + referenced_assets(os.path.join(root, "index.html")) + DATA_FILES
+    seen = []
+    for name in files:
+        if name not in seen and os.path.exists(os.path.join(root, name)):
+            seen.append(name)
+    return seen
+
+
+def precompress(path):
+    """Write path.gz (and path.br) next to path; returns the variants written."""
+    with open(path, "rb") as f:
+        data = f.read()
+    if len(data) < MIN_COMPRESS_BYTES:
+        return []
+    written = []
+    # mtime=0 keeps the output identical between builds
+    with open(path + ".gz", "wb") as f:
+        f.write(gzip.compress(data, compresslevel=9, mtime=0))
+    written.append(path + ".gz")
+    if brotli is not None:
+        with open(path + ".br", "wb") as f:
+            f.write(brotli.compress(data, quality=11))
+        written.append(path + ".br")
+    return written
+
+
+def _png_chunks(data):
+    pos = len(PNG_SIGNATURE)
+    while pos < len(data):
+        length, kind = struct.unpack(">I4s", data[pos:pos + 8])
+        yield kind, data[pos + 8:pos + 8 + length]
+        pos += 12 + length
+
+
+def _png_chunk(kind, body):
+    return struct.pack(">I", len(body)) + kind + body + struct.pack(">I", zlib.crc32(kind + body))
+
+
+def recompress_png(path):
+    """Losslessly re-deflate a PNG at maximum compression; returns (old, new) sizes.
+
+    The pixel data is inflated and deflated again at level 9 into a single
+    IDAT, and metadata chunks are dropped. The file is only replaced when
+    the result is smaller.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    if not data.startswith(PNG_SIGNATURE):
+        raise ValueError(f"{path} is not a PNG file")
+    chunks = list(_png_chunks(data))
+    pixels = zlib.decompress(b"".join(body for kind, body in chunks if kind == b"IDAT"))
+    compressor = zlib.compressobj(9, zlib.DEFLATED, 15, 9)
+    idat = compressor.compress(pixels) + compressor.flush()
+
+    out = [PNG_SIGNATURE]
+    for kind, body in chunks:
+        if kind == b"IEND":
+            out.append(_png_chunk(b"IDAT", idat))
+        if kind in PNG_KEEP:
+            out.append(_png_chunk(kind, body))
+    result = b"".join(out)
+    if len(result) >= len(data):
+        return len(data), len(data)
+    with open(path, "wb") as f:
+        f.write(result)
+    return len(data), len(result)
+
+
+def _sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def recompress_charts(root=".", cache_path=CHART_CACHE):
+    # Keep chart_render's cache valid: entries pointing at the old bytes move to the new ones
+    cache = {}
+    if os.path.exists(os.path.join(root, cache_path)):
+        with open(os.path.join(root, cache_path), encoding="utf-8") as f:
+            cache = json.load(f)
+    results = []
+    for path in sorted(glob.glob(os.path.join(root, "*.png"))):
+        with open(path, "rb") as f:
+            before = _sha256(f.read())
+        old, new = recompress_png(path)
+        results.append((path, old, new))
+        entry = cache.get(os.path.relpath(path, root))
+        if new < old and entry and entry.get("image") == before:
+            with open(path, "rb") as f:
+                entry["image"] = _sha256(f.read())
+    if cache:
+        with open(os.path.join(root, cache_path), "w", encoding="utf-8") as f:
+            json.dump(cache, f, indent=2, sort_keys=True)
+            f.write("\n")
+    return results
+
+
+def build(root=".", out_dir="dist"):
+    """Copy the site into out_dir and pre-compress it; returns (raw bytes, list of files)."""
+    if os.path.exists(out_dir):
+        shutil.rmtree(out_dir)
+    copied = []
+    for name in site_files(root):
+        src, dst = os.path.join(root, name), os.path.join(out_dir, name)
+        if os.path.isdir(src):
+            shutil.copytree(src, dst)
+            copied.extend(os.path.join(dirpath, f) for dirpath, _, files in os.walk(dst) for f in files)
+        else:
+            os.makedirs(os.path.dirname(dst) or ".", exist_ok=True)
+            shutil.copy2(src, dst)
+            copied.append(dst)
+
+    raw = sum(os.path.getsize(path) for path in copied)
+    for path in copied:
+        if os.path.splitext(path)[1].lower() in COMPRESSIBLE:
+            precompress(path)
+    return raw, copied
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build a minimal pre-compressed dist/ for GitHub Pages")
+    parser.add_argument("-o", "--output", default="dist", help="output directory (default: dist)")
+    parser.add_argument("--no-png", action="store_true", help="skip recompressing the chart PNGs")
+    args = parser.parse_args(argv)
+
+    if not args.no_png:
+        for path, old, new in recompress_charts():
+            print(f"- {os.path.relpath(path)}: {old:,} -> {new:,} bytes")
+
+    raw, copied = build(".", args.output)
+    gz = sum(os.path.getsize(path + ".gz") for path in copied if os.path.exists(path + ".gz"))
+    print(f"{len(copied)} files, {raw:,} bytes in {args.output}/ ({gz:,} bytes as .gz for compressible files)")
+    if brotli is None:
+        print("brotli is not installed, .br variants were skipped (pip install brotli)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
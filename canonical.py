@@ -0,0 +1,169 @@
+"""Canonical model identifiers and duplicate removal for model_list.csv.
+
+The same model shows up under several feeds and naming variants, e.g. a
+Discovery Tool row and a New Arena Models row for one release, or
+gemini-1.5-flash-001 and gemini-1.5-flash-001-tuning. This stage
+
+- parses structured comments ("ID: ...; Provider: ...") into model_id and
+  provider columns in one vectorised pass,
+- derives a canonical_name from the ID (or the model name) by lowercasing,
+  unifying separators and dropping variant suffixes, and
+- drops every event that repeats the previous status of the same model in
+  the same feed, found through a hash index of (model_name, source) -> last
+  status.
+
+The log pairs Added and Removed per (model_name, source), which is how
+asof.py and ingest.py read it. Events are therefore never collapsed across
+feeds or naming variants in the log itself. Rows are
+kept in their original order and format, so the result is a smaller
+model_list.csv that validates against the same headers.
+
+--with-columns instead writes a derived view: the parsed columns are added
+and the status history is collapsed across feeds and variants, one event per
+change of a canonical model's status. A model's ID and provider are taken from any
+feed's row, so a Discovery Tool comment also describes the matching New
+Arena Models row.
+
+    python canonical.py model_list.csv -o model_list.csv
+    python canonical.py model_list.csv --with-columns -o canonical_view.csv
+"""
+import argparse
+import re
+import sys
+
+import numpy as np
+import pandas as pd
+
+from csv_reader import read_frame, read_header
+
+COMMENT_FIELDS = re.compile(r"^\s*ID:\s*(?P<model_id>[^;]*?)\s*;\s*Provider:\s*(?P<provider>.*?)\s*$")
+# Suffixes naming a variant of the same model rather than a new one
+VARIANT_SUFFIXES = ("-tuning",)
+CANONICAL_COLUMNS = ["canonical_name", "model_id", "provider"]
+
+
+def parse_comments(comments):
+    """Split "ID: ...; Provider: ..." comments into model_id and provider ("" otherwise)."""
+    return comments.fillna("").astype(str).str.extract(COMMENT_FIELDS).fillna("")
+
+
+def canonical_names(names, suffixes=VARIANT_SUFFIXES):
+    names = (names.fillna("").astype(str).str.strip().str.lower()
+             .str.replace(r"^models/", "", regex=True)
+             .str.replace(r"[\s_]+", "-", regex=True))
+    if suffixes:
+        names = names.str.replace("(?:" + "|".join(map(re.escape, suffixes)) + ")$", "", regex=True)
+    return names
+
+
+def add_canonical_columns(df, suffixes=VARIANT_SUFFIXES):
+    """Return df with canonical_name, model_id and provider columns added."""
+    if "comments" in df:
+        parsed = parse_comments(df["comments"])
+    else:
+        parsed = pd.DataFrame({"model_id": "", "provider": ""}, index=df.index)
+    ids = parsed["model_id"].where(parsed["model_id"] != "", df["model_name"])
+    return df.assign(canonical_name=canonical_names(ids, suffixes),
+                     model_id=parsed["model_id"], provider=parsed["provider"])
+
+
+class Canonicaliser:
+    """Drop repeated events across DataFrame chunks fed in time order.
+
+    State is kept per (model_name, source), the pairs asof.py reads, so only
+    repeats within one feed are dropped. per_source=False keys on
+    canonical_name and collapses across feeds and variants, for views only.
+    """
+
+    def __init__(self, suffixes=VARIANT_SUFFIXES, per_source=True):
+        self.suffixes = suffixes
+        self.per_source = per_source
+        self.last_status = {}
+        self.dropped = 0
+
+    def _column(self, df, name):
+        if name not in df:
+            return np.full(len(df), "", dtype=object)
+        return df[name].fillna("").astype(str).to_numpy(dtype=object)
+
+    def keep_mask(self, df):
+        if self.per_source:
+            names = list(zip(self._column(df, "model_name"), self._column(df, "source")))
+        else:
+            names = canonical_names(self._ids(df), self.suffixes).to_numpy(dtype=object)
+        statuses = self._column(df, "status")
+        keep = np.ones(len(df), dtype=bool)
+        last_status = self.last_status
+        for i, (name, status) in enumerate(zip(names, statuses)):
+            if last_status.get(name) == status:
+                keep[i] = False
+            else:
+                last_status[name] = status
+        self.dropped += int((~keep).sum())
+        return keep
+
+    def _ids(self, df):
+        if "comments" not in df:
+            return df["model_name"]
+        model_id = parse_comments(df["comments"])["model_id"]
+        return model_id.where(model_id != "", df["model_name"])
+
+    def apply(self, df):
+        return df[self.keep_mask(df)]
+
+
+def time_order(df):
+    # Positions of the rows oldest first; ties keep file order
+    columns = [c for c in ("date", "time", "release_date") if c in df]
+    if not columns:
+        return np.arange(len(df))
+    return np.lexsort([df[c].fillna("").astype(str).to_numpy() for c in reversed(columns)])
+
+
+def canonicalise(df, suffixes=VARIANT_SUFFIXES, per_source=True):
+    """Return (deduplicated df in its original row order, rows dropped)."""
+    order = time_order(df)
+    keep = np.empty(len(df), dtype=bool)
+    canonicaliser = Canonicaliser(suffixes, per_source)
+    keep[order] = canonicaliser.keep_mask(df.iloc[order])
+    return df[keep], canonicaliser.dropped
+
+
+def canonical_view(df, suffixes=VARIANT_SUFFIXES):
+    """Return (cross-feed view with the parsed columns, rows dropped); not a valid log."""
+    full = add_canonical_columns(df, suffixes)
+    view, dropped = canonicalise(df, suffixes, per_source=False)
+    view = full.loc[view.index].copy()
+    # Fill the ID and provider from whichever feed's row has them
+    for column in ("model_id", "provider"):
+        known = full[column].where(full[column] != "").groupby(full["canonical_name"]).first()
+        view[column] = view["canonical_name"].map(known).fillna(view[column])
+    return view, dropped
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Canonicalise model names and drop duplicate events")
+    parser.add_argument("csv", nargs="?", default="model_list.csv")
+    parser.add_argument("--headers", default="model_list_headers.csv",
+                        help="CSV whose first row is the header (used when the file has none)")
+    parser.add_argument("-o", "--output", help="output path, may be the input (default: stdout)")
+    parser.add_argument("--with-columns", action="store_true",
+                        help=f"write the cross-feed view with {', '.join(CANONICAL_COLUMNS)} and a header row")
+    args = parser.parse_args(argv)
+
+    header = read_header(args.headers)
+    has_header = read_header(args.csv) == header
+    df = read_frame(args.csv, header)
+    if args.with_columns:
+        out, dropped = canonical_view(df)
+    else:
+        out, dropped = canonicalise(df)
+
+    out.to_csv(args.output or sys.stdout, index=False, header=has_header or args.with_columns,
+               lineterminator="\n")
+    print(f"{len(df)} rows, {dropped} duplicate(s) dropped, {len(out)} kept", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
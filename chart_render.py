@@ -0,0 +1,192 @@
+"""Render the dashboard charts in one batch with a single warm Kaleido.
+
+Calling fig.write_image() per chart starts a fresh renderer every time.
+Here every figure is handed to one renderer in a single call, and with
+Kaleido 1.x the renderer runs several browser tabs in parallel.
+
+    python chart_render.py                      # all charts, PNG
+    python chart_render.py --formats png svg --workers 4
+
+Renders are cached by content: a chart is skipped when the hash of its
+figure spec and layout matches the manifest entry and the image on disk is
+the one that was written for it.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+
+import plotly
+import plotly.io as pio
+from plotly.utils import PlotlyJSONEncoder
+
+import chart_script
+import chart_script_1
+
+CACHE_MANIFEST = "chart_cache.json"
+
+# Output path -> function building the figure
+CHARTS = {
+    chart_script.OUTPUT: chart_script.build_figure,
+    chart_script_1.OUTPUT: chart_script_1.build_figure,
+}
+
+
+def expand_formats(jobs, formats):
+    # One job per requested format, swapping the file extension
+    if not formats:
+        return list(jobs)
+    return [(fig, f"{os.path.splitext(path)[0]}.{fmt}") for fig, path in jobs for fmt in formats]
+
+
+def figure_hash(fig, path):
+    # Covers data, layout and template, plus anything else that changes the image
+    spec = fig.to_plotly_json() if hasattr(fig, "to_plotly_json") else fig
+    payload = json.dumps({
+        "figure": spec,
+        "format": os.path.splitext(path)[1].lower(),
+        "plotly": plotly.__version__,
+    }, sort_keys=True, cls=PlotlyJSONEncoder)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class RenderCache:
+    """Manifest of output path -> (figure hash, image hash) for finished renders."""
+
+    def __init__(self, path=CACHE_MANIFEST):
+        self.path = path
+        self.entries = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.entries = json.load(f)
+
+    def is_fresh(self, fig, path):
+        entry = self.entries.get(os.path.normpath(path))
+        return (entry is not None and os.path.exists(path)
+                and entry["figure"] == figure_hash(fig, path) and entry["image"] == file_hash(path))
+
+    def record(self, fig, path):
+        self.entries[os.path.normpath(path)] = {"figure": figure_hash(fig, path), "image": file_hash(path)}
+
+    def evict_stale(self):
+        # Drop entries whose image has been deleted
+        for path in [p for p in self.entries if not os.path.exists(p)]:
+            del self.entries[path]
+
+    def save(self):
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, indent=2, sort_keys=True)
+            f.write("\n")
+
+
+def _browser_available():
+    # Kaleido's sync server thread dies silently without Chrome, leaving callers waiting forever
+    if os.environ.get("BROWSER_PATH"):
+        return True
+    try:
+        from choreographer.browsers.chromium import Chromium
+    except ImportError:
+        return True  # unknown layout; let Kaleido report it
+    return Chromium.find_browser(skip_local=False) is not None
+
+
+class BatchRenderer:
+    """Context manager keeping one Kaleido renderer alive for many renders."""
+
+    def __init__(self, workers=4):
+        self.workers = workers
+        self._server = False
+
+    def __enter__(self):
+        # Kaleido >= 1.0 runs a shared browser with one tab per worker. Older
+        # Kaleido keeps its own subprocess alive between calls in a process.
+        if hasattr(pio, "write_images"):
+            import kaleido
+
+            if not _browser_available():
+                raise RuntimeError("Kaleido needs Chrome to render images; install it with kaleido_get_chrome")
+            kaleido.start_sync_server(n=self.workers, silence_warnings=True)
+            self._server = True
+        return self
+
+    def render(self, jobs):
+        """Render a list of (figure, path) pairs; the format follows the suffix."""
+        jobs = list(jobs)
+        if not jobs:
+            return
+        if hasattr(pio, "write_images"):
+            pio.write_images([fig for fig, _ in jobs], [path for _, path in jobs])
+        else:
+            for fig, path in jobs:
+                pio.write_image(fig, path)
+
+    def __exit__(self, *exc):
+        if self._server:
+            import kaleido
+
+            kaleido.stop_sync_server(silence_warnings=True)
+            self._server = False
+
+
+def render_batch(jobs, workers=4, formats=None, cache=None):
+    """Render (figure, path) jobs, skipping those the cache says are current.
+
+    Returns the lists of rendered and skipped output paths.
+    """
+    jobs = expand_formats(jobs, formats)
+    if cache is not None:
+        pending = [(fig, path) for fig, path in jobs if not cache.is_fresh(fig, path)]
+    else:
+        pending = jobs
+
+    # Nothing to do means the renderer is never started
+    if pending:
+        with BatchRenderer(workers) as renderer:
+            renderer.render(pending)
+
+    if cache is not None:
+        for fig, path in pending:
+            cache.record(fig, path)
+        cache.evict_stale()
+        cache.save()
+
+    rendered = [path for _, path in pending]
+    return rendered, [path for _, path in jobs if path not in rendered]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render all dashboard charts in one batch")
+    parser.add_argument("charts", nargs="*", help=f"outputs to render (default: all of {list(CHARTS)})")
+    parser.add_argument("--formats", nargs="+", choices=["png", "svg", "jpg", "webp", "pdf"],
+                        help="formats to write (default: the suffix of each output)")
+    parser.add_argument("--workers", type=int, default=4, help="parallel renders (default: 4)")
+    parser.add_argument("--cache", default=CACHE_MANIFEST, help=f"render cache manifest (default: {CACHE_MANIFEST})")
+    parser.add_argument("--no-cache", action="store_true", help="always re-render")
+    args = parser.parse_args(argv)
+
+    names = args.charts or list(CHARTS)
+    unknown = [name for name in names if name not in CHARTS]
+    if unknown:
+        parser.error(f"unknown chart(s): {', '.join(unknown)}")
+
+    cache = None if args.no_cache else RenderCache(args.cache)
+    rendered, skipped = render_batch([(CHARTS[name](), name) for name in names],
+                                     args.workers, args.formats, cache)
+    for path in rendered:
+        print(f"- {path}")
+    for path in skipped:
+        print(f"- {path} (unchanged, skipped)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -50,130 +50,144 @@ type_symbols = {
     "users": "star"
 }
 
-fig = go.Figure()
 
-# Add component nodes
-for component in data["components"]:
-    name = component["name"]
-    comp_type = component["type"]
-    x, y = positions[name]
-    
-    # Abbreviate long names for display
-    display_name = name
-    if len(display_name) > 15:
-        if "Data Sources" in display_name:
-            display_name = "Data Sources"
-        elif "Deployment" in display_name:
-            display_name = "Deploy"
-    
-    # Create hover text with items
-    items_text = "<br>".join([item[:12] + "..." if len(item) > 12 else item 
-                             for item in component["items"][:6]])  # Limit to 6 items
-    hover_text = f"<b>{name}</b><br>{items_text}"
-    
+def build_figure():
+    fig = go.Figure()
+
+    # Add component nodes, one trace per type so each gets a legend entry
+    for component in data["components"]:
+        name = component["name"]
+        comp_type = component["type"]
+        x, y = positions[name]
+        
+        # Abbreviate long names for display
+        display_name = name
+        if len(display_name) > 15:
+            if "Data Sources" in display_name:
+                display_name = "Data Sources"
+            elif "Deployment" in display_name:
+                display_name = "Deploy"
+        
+        # Create hover text with items
+        items_text = "<br>".join([item[:12] + "..." if len(item) > 12 else item 
+                                 for item in component["items"][:6]])  # Limit to 6 items
+        hover_text = f"<b>{name}</b><br>{items_text}"
+        
+        fig.add_trace(go.Scatter(
+            x=[x], y=[y],
+            mode='markers+text',
+            marker=dict(
+                size=30,
+                color=type_colors[comp_type],
+                symbol=type_symbols[comp_type],
+                line=dict(width=2, color='white')
+            ),
+            text=[display_name],
+            textposition="middle center",
+            hovertemplate=hover_text + "<extra></extra>",
+            name=comp_type.title(),
+            showlegend=True,
+            textfont=dict(size=10, color='black')
+        ))
+
+    # Add Users node
     fig.add_trace(go.Scatter(
-        x=[x], y=[y],
+        x=[positions["Users"][0]], y=[positions["Users"][1]],
         mode='markers+text',
         marker=dict(
             size=30,
-            color=type_colors[comp_type],
-            symbol=type_symbols[comp_type],
+            color=type_colors["users"],
+            symbol=type_symbols["users"],
             line=dict(width=2, color='white')
         ),
-        text=[display_name],
+        text=["Users"],
         textposition="middle center",
-        hovertemplate=hover_text + "<extra></extra>",
-        name=comp_type.title(),
+        hovertemplate="<b>Users</b><br>End Users<br>Developers<extra></extra>",
+        name="Users",
         showlegend=True,
         textfont=dict(size=10, color='black')
     ))
 
-# Add Users node
-fig.add_trace(go.Scatter(
-    x=[positions["Users"][0]], y=[positions["Users"][1]],
-    mode='markers+text',
-    marker=dict(
-        size=30,
-        color=type_colors["users"],
-        symbol=type_symbols["users"],
-        line=dict(width=2, color='white')
-    ),
-    text=["Users"],
-    textposition="middle center",
-    hovertemplate="<b>Users</b><br>End Users<br>Developers<extra></extra>",
-    name="Users",
-    showlegend=True,
-    textfont=dict(size=10, color='black')
-))
+    # Add flow arrows: all lines go in one trace (None breaks the segments)
+    # and all arrow heads in another, instead of two traces per flow
+    line_x, line_y, line_labels = [], [], []
+    head_x, head_y = [], []
+    for flow in data["flow"]:
+        from_pos = positions[flow["from"]]
+        to_pos = positions[flow["to"]]
+        
+        line_x += [from_pos[0], to_pos[0], None]
+        line_y += [from_pos[1], to_pos[1], None]
+        line_labels += [flow["label"], flow["label"], None]
+        
+        # Calculate arrow direction
+        dx = to_pos[0] - from_pos[0]
+        dy = to_pos[1] - from_pos[1]
+        length = (dx**2 + dy**2)**0.5
+        
+        # Normalize and scale
+        if length > 0:
+            dx_norm = dx / length * 0.3
+            dy_norm = dy / length * 0.3
+            
+            # Arrow head position (closer to target)
+            head_x.append(to_pos[0] - dx_norm)
+            head_y.append(to_pos[1] - dy_norm)
 
-# Add flow arrows
-for flow in data["flow"]:
-    from_pos = positions[flow["from"]]
-    to_pos = positions[flow["to"]]
-    
-    # Add arrow line
     fig.add_trace(go.Scatter(
-        x=[from_pos[0], to_pos[0]],
-        y=[from_pos[1], to_pos[1]],
+        x=line_x,
+        y=line_y,
         mode='lines',
         line=dict(width=2, color='#13343B'),
-        hovertemplate=f"<b>{flow['label']}</b><extra></extra>",
+        text=line_labels,
+        hovertemplate="<b>%{text}</b><extra></extra>",
         showlegend=False
     ))
-    
-    # Add arrow head (small triangle)
-    # Calculate arrow direction
-    dx = to_pos[0] - from_pos[0]
-    dy = to_pos[1] - from_pos[1]
-    length = (dx**2 + dy**2)**0.5
-    
-    # Normalize and scale
-    if length > 0:
-        dx_norm = dx / length * 0.3
-        dy_norm = dy / length * 0.3
-        
-        # Arrow head position (closer to target)
-        arrow_x = to_pos[0] - dx_norm
-        arrow_y = to_pos[1] - dy_norm
-        
-        fig.add_trace(go.Scatter(
-            x=[arrow_x],
-            y=[arrow_y],
-            mode='markers',
-            marker=dict(
-                size=8,
-                color='#13343B',
-                symbol='triangle-right'
-            ),
-            showlegend=False,
-            hoverinfo='skip'
-        ))
+    fig.add_trace(go.Scatter(
+        x=head_x,
+        y=head_y,
+        mode='markers',
+        marker=dict(
+            size=8,
+            color='#13343B',
+            symbol='triangle-right'
+        ),
+        showlegend=False,
+        hoverinfo='skip'
+    ))
+
+    # Update layout
+    fig.update_layout(
+        title="AI Models Dashboard Architecture",
+        xaxis=dict(
+            showgrid=False,
+            showticklabels=False,
+            zeroline=False,
+            range=[0, 8]
+        ),
+        yaxis=dict(
+            showgrid=False,
+            showticklabels=False,  
+            zeroline=False,
+            range=[1, 6]
+        ),
+        legend=dict(
+            orientation='h',
+            yanchor='bottom',
+            y=1.05,
+            xanchor='center',
+            x=0.5
+        ),
+        plot_bgcolor='white',
+        paper_bgcolor='white'
+    )
+    return fig
+
+
+OUTPUT = "dashboard_architecture.png"
 
-# Update layout
-fig.update_layout(
-    title="AI Models Dashboard Architecture",
-    xaxis=dict(
-        showgrid=False,
-        showticklabels=False,
-        zeroline=False,
-        range=[0, 8]
-    ),
-    yaxis=dict(
-        showgrid=False,
-        showticklabels=False,  
-        zeroline=False,
-        range=[1, 6]
-    ),
-    legend=dict(
-        orientation='h',
-        yanchor='bottom',
-        y=1.05,
-        xanchor='center',
-        x=0.5
-    ),
-    plot_bgcolor='white',
-    paper_bgcolor='white'
-)
+if __name__ == '__main__':
+    # Save the chart, skipped when the cached render is still current
+    from chart_render import RenderCache, render_batch
 
-# Save the chart
-fig.write_image("dashboard_architecture.png")
\ No newline at end of file
+    render_batch([(build_figure(), OUTPUT)], cache=RenderCache())
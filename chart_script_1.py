@@ -1,154 +1,174 @@
+import glob
+import json
+import os
+
+import pandas as pd
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-import plotly.express as px
-
-# Parse the data
-data = {
-  "features": {
-    "Core Features": [
-      {"name": "Interactive Table", "value": 15, "max": 15, "unit": "models", "status": "complete"},
-      {"name": "Search & Filter", "value": 100, "max": 100, "unit": "%", "status": "complete"},
-      {"name": "Provider Tags", "value": 8, "max": 10, "unit": "providers", "status": "active"},
-      {"name": "Export Options", "value": 2, "max": 3, "unit": "formats", "status": "active"},
-      {"name": "Themes", "value": 2, "max": 2, "unit": "modes", "status": "complete"}
-    ],
-    "Performance": [
-      {"name": "Load Time", "value": 2.1, "max": 3.0, "unit": "seconds", "status": "excellent"},
-      {"name": "Mobile Score", "value": 95, "max": 100, "unit": "%", "status": "excellent"},
-      {"name": "Accessibility", "value": 98, "max": 100, "unit": "%", "status": "excellent"},
-      {"name": "SEO Score", "value": 92, "max": 100, "unit": "%", "status": "good"}
-    ],
-    "Security": [
-      {"name": "Input Sanitization", "value": 100, "max": 100, "unit": "%", "status": "secure"},
-      {"name": "CSP Headers", "value": 100, "max": 100, "unit": "%", "status": "secure"},
-      {"name": "HTTPS Only", "value": 100, "max": 100, "unit": "%", "status": "secure"},
-      {"name": "XSS Protection", "value": 100, "max": 100, "unit": "%", "status": "secure"}
-    ],
-    "Compatibility": [
-      {"name": "Modern Browsers", "value": 100, "max": 100, "unit": "%", "status": "supported"},
-      {"name": "Mobile Devices", "value": 100, "max": 100, "unit": "%", "status": "supported"},
-      {"name": "Screen Sizes", "value": 5, "max": 5, "unit": "ranges", "status": "responsive"},
-      {"name": "GitHub Pages", "value": 100, "max": 100, "unit": "%", "status": "compatible"}
-    ]
-  }
-}
+
+from csv_reader import read_frame, read_header
+from providers import ProviderClassifier
+
+# Inputs; every metric in the chart is computed from these at build time
+MODEL_CSV = 'model_list.csv'
+HEADERS_CSV = 'model_list_headers.csv'
+BENCHMARK_JSON = 'bench_results.json'
+LIGHTHOUSE_REPORTS = '.lighthouseci/lhr-*.json'
+
+LIGHTHOUSE_CATEGORIES = ['performance', 'accessibility', 'best-practices', 'seo']
 
 # Color palette
 colors = ['#1FB8CD', '#FFC185', '#ECEBD5', '#5D878F', '#D2BA4C']
 
-# Create subplots for dashboard layout
-fig = make_subplots(
-    rows=2, cols=2,
-    subplot_titles=('Core Features', 'Performance', 'Security', 'Compatibility'),
-    specs=[[{"type": "bar"}, {"type": "bar"}],
-           [{"type": "bar"}, {"type": "bar"}]],
-    vertical_spacing=0.12,
-    horizontal_spacing=0.1
-)
-
-# Function to calculate completion percentage
-def calc_completion(feature):
-    if feature['name'] == 'Load Time':
-        # For load time, lower is better
-        return round(((feature['max'] - feature['value']) / feature['max']) * 100)
-    else:
-        return round((feature['value'] / feature['max']) * 100)
-
-# Function to create display text
-def create_display_text(feature):
-    if feature['unit'] == '%':
-        return f"{feature['value']}{feature['unit']}"
-    elif feature['unit'] == 'seconds':
-        return f"{feature['value']}s"
-    else:
-        return f"{feature['value']}/{feature['max']}"
-
-# Category positions
-positions = {
-    'Core Features': (1, 1),
-    'Performance': (1, 2), 
-    'Security': (2, 1),
-    'Compatibility': (2, 2)
-}
-
-category_colors = {
-    'Core Features': colors[0],
-    'Performance': colors[1], 
-    'Security': colors[2],
-    'Compatibility': colors[3]
-}
-
-# Add bars for each category
-for category, features in data['features'].items():
-    row, col = positions[category]
-    
-    # Prepare data for this category
-    feature_names = []
-    percentages = []
-    display_texts = []
-    hover_texts = []
-    
-    for feature in features:
-        # Shorten names to fit character limit
-        short_name = feature['name'][:12]
-        if len(feature['name']) > 12:
-            short_name = feature['name'][:12] + "..."
-        feature_names.append(short_name)
-        
-        completion = calc_completion(feature)
-        percentages.append(completion)
-        
-        display_text = create_display_text(feature)
-        display_texts.append(display_text)
-        
-        hover_text = f"{feature['name']}<br>Value: {display_text}<br>Status: {feature['status']}<br>Completion: {completion}%"
-        hover_texts.append(hover_text)
-    
-    # Add horizontal bar chart for this category
-    fig.add_trace(
-        go.Bar(
-            name=category,
-            y=feature_names,
-            x=percentages,
-            orientation='h',
-            marker_color=category_colors[category],
-            text=display_texts,
-            textposition='auto',
-            hovertemplate='%{hovertext}<extra></extra>',
-            hovertext=hover_texts,
-            cliponaxis=False,
-            showlegend=False
-        ),
-        row=row, col=col
+status_colors = {'Added': colors[0], 'Removed': colors[1]}
+
+
+def load_models(path=MODEL_CSV, headers=HEADERS_CSV):
+    # model_list.csv is published without a header row
+    header = read_header(headers) if os.path.exists(headers) else None
+    return read_frame(path, header)
+
+
+def current_models(df):
+    # Last event per model and feed wins; removed models are no longer listed
+    keys = [c for c in ('model_name', 'source') if c in df]
+    order = [c for c in ('date', 'time', 'release_date') if c in df]
+    latest = df.sort_values(order, kind='stable') if order else df
+    latest = latest.drop_duplicates(keys, keep='last')
+    if 'status' in latest:
+        latest = latest[latest['status'] != 'Removed']
+    return latest
+
+
+def source_counts(df):
+    return current_models(df)['source'].value_counts().sort_values()
+
+
+def daily_changes(df):
+    # Days x {Added, Removed} event counts
+    day = 'date' if 'date' in df else 'release_date'
+    changes = pd.crosstab(df[day], df['status'])
+    return changes.reindex(columns=list(status_colors), fill_value=0).sort_index()
+
+
+def provider_coverage(df, rules=None):
+    # Share of listed models whose name matches a provider rule
+    models = current_models(df)[['model_name']]
+    providers = ProviderClassifier(rules, fallback='Other').classify(models)
+    counts = providers.value_counts().sort_values()
+    coverage = (providers != 'Other').mean() * 100 if len(providers) else 0.0
+    return counts, coverage
+
+
+def latest_lighthouse(pattern=LIGHTHOUSE_REPORTS):
+    reports = sorted(glob.glob(pattern), key=os.path.getmtime)
+    if not reports:
+        return None
+    with open(reports[-1], encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_timings(benchmark=BENCHMARK_JSON, lighthouse=LIGHTHOUSE_REPORTS):
+    """Return (label -> value, unit) from Lighthouse if available, else the benchmark."""
+    report = latest_lighthouse(lighthouse)
+    if report is not None:
+        categories = report.get('categories', {})
+        scores = {categories[c].get('title', c): round(categories[c]['score'] * 100)
+                  for c in LIGHTHOUSE_CATEGORIES if categories.get(c, {}).get('score') is not None}
+        return scores, '%'
+    if os.path.exists(benchmark):
+        with open(benchmark, encoding='utf-8') as f:
+            results = json.load(f).get('results') or []
+        if results:
+            # Stage timings at the largest benchmarked size
+            largest = max(results, key=lambda entry: entry['rows'])
+            return {f"{stage} ({largest['rows']:,} rows)": round(seconds, 3)
+                    for stage, seconds in largest['seconds'].items() if seconds is not None}, 's'
+    return {}, ''
+
+
+def load_metrics(path=MODEL_CSV, headers=HEADERS_CSV, benchmark=BENCHMARK_JSON,
+                 lighthouse=LIGHTHOUSE_REPORTS):
+    df = load_models(path, headers)
+    providers, coverage = provider_coverage(df)
+    timings, unit = load_timings(benchmark, lighthouse)
+    return {
+        'sources': source_counts(df),
+        'changes': daily_changes(df),
+        'providers': providers,
+        'coverage': coverage,
+        'timings': timings,
+        'timing_unit': unit,
+        'total': len(current_models(df)),
+    }
+
+
+def _hbar(series, color, unit=''):
+    labels = [str(label) for label in series.index]
+    return go.Bar(
+        y=labels,
+        x=list(series.values),
+        orientation='h',
+        marker_color=color,
+        text=[f"{value}{unit}" for value in series.values],
+        textposition='auto',
+        cliponaxis=False,
+        showlegend=False
     )
-    
-    # Update subplot axes
-    fig.update_xaxes(
-        range=[0, 105],
-        title_text="Completion %",
-        row=row, col=col
+
+
+def build_figure(metrics=None):
+    if metrics is None:
+        metrics = load_metrics()
+
+    # Create subplots for dashboard layout
+    fig = make_subplots(
+        rows=2, cols=2,
+        subplot_titles=('Models per Source', f"Provider Coverage ({metrics['coverage']:.0f}%)",
+                        'Added / Removed per Day', 'Performance'),
+        vertical_spacing=0.15,
+        horizontal_spacing=0.15
     )
-    fig.update_yaxes(
-        title_text="Features",
-        row=row, col=col
+
+    fig.add_trace(_hbar(metrics['sources'], colors[0]), row=1, col=1)
+    fig.update_xaxes(title_text="Models", row=1, col=1)
+
+    fig.add_trace(_hbar(metrics['providers'], colors[3]), row=1, col=2)
+    fig.update_xaxes(title_text="Models", row=1, col=2)
+
+    changes = metrics['changes']
+    for status, color in status_colors.items():
+        fig.add_trace(
+            go.Bar(name=status, x=[str(day) for day in changes.index], y=list(changes[status]),
+                   marker_color=color),
+            row=2, col=1
+        )
+    fig.update_xaxes(type='category', row=2, col=1)
+    fig.update_yaxes(title_text="Events", row=2, col=1)
+
+    timings = pd.Series(metrics['timings'], dtype=float)
+    unit = metrics['timing_unit']
+    if len(timings):
+        fig.add_trace(_hbar(timings, colors[4], unit), row=2, col=2)
+        fig.update_xaxes(title_text="Score %" if unit == '%' else "Seconds", row=2, col=2)
+    else:
+        fig.add_annotation(text="No benchmark or Lighthouse results", showarrow=False,
+                           xref='x4 domain', yref='y4 domain', x=0.5, y=0.5)
+
+    # Update overall layout
+    fig.update_layout(
+        title=f"AI Dashboard Overview - {metrics['total']} Models Listed",
+        font=dict(size=10),
+        barmode='group',
+        legend=dict(orientation='h', yanchor='bottom', y=-0.15, xanchor='center', x=0.5)
     )
+    return fig
+
+
+OUTPUT = 'ai_dashboard_features.png'
+
+if __name__ == '__main__':
+    # Save the chart, skipped when the cached render is still current
+    from chart_render import RenderCache, render_batch
 
-# Create summary statistics
-total_features = sum(len(features) for features in data['features'].values())
-completed_features = 0
-for features in data['features'].values():
-    for feature in features:
-        if calc_completion(feature) == 100:
-            completed_features += 1
-
-overall_completion = round((completed_features / total_features) * 100)
-
-# Update overall layout
-fig.update_layout(
-    title=f'AI Dashboard Overview - {overall_completion}% Complete',
-    font=dict(size=10),
-    showlegend=False
-)
-
-# Save the chart
-fig.write_image('ai_dashboard_features.png')
\ No newline at end of file
+    render_batch([(build_figure(), OUTPUT)], cache=RenderCache())
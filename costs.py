@@ -0,0 +1,140 @@
+"""Typed parameter/price columns and vectorised cost projections.
+
+`parameters` ("1.76T", "46.7B", "Unknown") and `cost_per_1k_tokens` are
+parsed once into numeric columns with NaN for unknown values, never 0, so
+an unpriced model cannot make a projection look cheaper than it is.
+
+A CostModel holds the catalogue's price vector. A workload is an array of
+token counts whose last axis is the catalogue's models, e.g. (days, models)
+or (scenarios, days, models). A projection is one matrix product over the
+whole array:
+
+    model = CostModel.from_frame(read_frame("catalogue.csv"))
+    workload = np.zeros((1000, 30, len(model)))   # scenarios x days x models
+    costs, unpriced = model.project(workload)     # (1000, 30) each
+
+    python costs.py workload.csv --catalogue catalogue.csv -o costs.csv
+"""
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+
+from csv_reader import read_frame
+from records import PARAMETER_RE, PARAMETER_SCALE
+
+PARAMETER_COUNT = "parameter_count"
+
+
+def parameter_counts(parameters):
+    """Vectorised records.parse_parameters: a float64 Series, NaN when unknown."""
+    parts = parameters.fillna("").astype(str).str.extract(PARAMETER_RE.pattern, flags=PARAMETER_RE.flags)
+    scale = parts[1].str.upper().map(PARAMETER_SCALE)
+    return pd.to_numeric(parts[0], errors="coerce") * scale
+
+
+def prices(costs):
+    # Unparseable and missing prices stay NaN instead of becoming 0
+    return pd.to_numeric(costs, errors="coerce").astype("float64")
+
+
+def add_numeric_columns(df):
+    """Return df with a nullable integer parameter_count and a float cost_per_1k_tokens."""
+    out = df.copy()
+    if "parameters" in out:
+        out[PARAMETER_COUNT] = parameter_counts(out["parameters"]).round().astype("Int64")
+    if "cost_per_1k_tokens" in out:
+        out["cost_per_1k_tokens"] = prices(out["cost_per_1k_tokens"])
+    return out
+
+
+class CostModel:
+    """Per-token prices for a list of models, in a fixed column order."""
+
+    def __init__(self, names, cost_per_1k_tokens):
+        self.names = list(names)
+        self.positions = {name: i for i, name in enumerate(self.names)}
+        if len(self.positions) != len(self.names):
+            raise ValueError("model names must be unique; deduplicate the catalogue first")
+        self.per_token = np.asarray(cost_per_1k_tokens, dtype=np.float64) / 1000
+        self.known = ~np.isnan(self.per_token)
+        # NaN would poison every sum it touches; unknown prices are tracked through `known` instead
+        self._filled = np.where(self.known, self.per_token, 0.0)
+
+    @classmethod
+    def from_frame(cls, df):
+        # The last row per model_name wins, as in the incremental writer
+        latest = df.drop_duplicates("model_name", keep="last")
+        return cls(latest["model_name"], prices(latest["cost_per_1k_tokens"]))
+
+    @classmethod
+    def from_records(cls, table):
+        # A records.RecordTable; the price column is read without copying
+        names = [table.value("model_name", i) for i in range(len(table))]
+        return cls(names, table.numpy("cost_per_1k_tokens"))
+
+    def __len__(self):
+        return len(self.names)
+
+    def align(self, names):
+        """Positions of names in this model's column order; KeyError for unknown models."""
+        return np.fromiter((self.positions[name] for name in names), dtype=np.intp, count=len(names))
+
+    def _check(self, workload):
+        workload = np.asarray(workload, dtype=np.float64)
+        if workload.shape[-1] != len(self):
+            raise ValueError(f"workload's last axis has {workload.shape[-1]} models, expected {len(self)}")
+        return workload
+
+    def cost_matrix(self, workload):
+        """Cost per model for every cell of workload (same shape); NaN where the price is unknown."""
+        return self._check(workload) * self.per_token
+
+    def project(self, workload):
+        """Return (cost, unpriced tokens), summed over the models axis.
+
+        Both are computed with one matrix product each over all leading axes,
+        so (scenarios, days, models) gives two (scenarios, days) arrays.
+        """
+        workload = self._check(workload)
+        return workload @ self._filled, workload @ (~self.known).astype(np.float64)
+
+
+def read_workload(path):
+    # Wide CSV: a "day" column, then one column of token counts per model
+    df = read_frame(path)
+    days = df.pop("day") if "day" in df else pd.Series(range(len(df)), name="day")
+    return days, list(df.columns), df.apply(pd.to_numeric, errors="coerce").fillna(0).to_numpy(np.float64)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Project daily costs of a token workload across the catalogue")
+    parser.add_argument("workload", help="CSV with a day column and one tokens column per model_name")
+    parser.add_argument("--catalogue", default="model_list.csv",
+                        help="CSV with model_name and cost_per_1k_tokens columns (default: model_list.csv)")
+    parser.add_argument("-o", "--output", help="output CSV (default: stdout)")
+    args = parser.parse_args(argv)
+
+    catalogue = read_frame(args.catalogue)
+    if "cost_per_1k_tokens" not in catalogue:
+        parser.error(f"{args.catalogue} has no cost_per_1k_tokens column")
+    model = CostModel.from_frame(catalogue)
+    days, names, tokens = read_workload(args.workload)
+    missing = [name for name in names if name not in model.positions]
+    if missing:
+        parser.error(f"models not in {args.catalogue}: {', '.join(missing)}")
+
+    # Scatter the workload's columns into the catalogue's order
+    workload = np.zeros((len(tokens), len(model)))
+    workload[:, model.align(names)] = tokens
+    cost, unpriced = model.project(workload)
+    out = pd.DataFrame({"day": days.to_numpy(), "cost": cost, "unpriced_tokens": unpriced})
+    out.to_csv(args.output or sys.stdout, index=False, lineterminator="\n")
+    if unpriced.any():
+        print(f"{int(unpriced.sum())} tokens went to models without a known price", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
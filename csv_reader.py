@@ -0,0 +1,127 @@
+"""RFC 4180 CSV reading shared by script.py and the validation tooling.
+
+Rows are tokenised by Python's C csv parser in strict mode, which handles
+quoted fields with embedded newlines, doubled quotes and CRLF line endings
+in a single streaming pass. Line numbers refer to the physical line a row
+starts on.
+
+normalise() rewrites a file into a canonical single-line form (LF line
+endings, no newlines inside fields, minimal quoting) that the simple
+line-based parser in app.js can read correctly.
+
+    python csv_reader.py model_list.csv --normalise -o model_list.csv
+"""
+import argparse
+import csv
+import os
+import sys
+import tempfile
+
+# Options every reader of the catalogue should use so values survive as text
+READ_OPTIONS = {"dtype": str, "keep_default_na": False, "encoding": "utf-8-sig"}
+
+
+class CSVFormatError(ValueError):
+    def __init__(self, line, message):
+        super().__init__(f"line {line}: {message}")
+        self.line = line
+        self.message = message
+
+
+def iter_rows(path, on_error=None):
+    """Yield (line, fields) for every record in the file at path.
+
+    Malformed quoting raises CSVFormatError, or if on_error is given it is
+    called with (line, message) and reading continues with the next record.
+    """
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f, strict=True)
+        while True:
+            line = reader.line_num + 1
+            try:
+                row = next(reader)
+            except StopIteration:
+                return
+            except csv.Error as e:
+                if on_error is None:
+                    raise CSVFormatError(line, str(e)) from None
+                on_error(line, str(e))
+                continue
+            yield line, row
+
+
+def read_header(path):
+    for _, row in iter_rows(path):
+        return row
+    return []
+
+
+def has_header(path, header):
+    return read_header(path) == list(header)
+
+
+def read_frame(path, header=None, **kwargs):
+    """Read the whole file as an all-string DataFrame.
+
+    With header=None the first row is the header. Otherwise header is the
+    expected column list and the file may or may not start with it, since
+    the published model_list.csv is headerless.
+    """
+    import pandas as pd  # only needed here; the streaming reader is stdlib-only
+
+    options = dict(READ_OPTIONS, **kwargs)
+    if header is None or has_header(path, header):
+        return pd.read_csv(path, **options)
+    return pd.read_csv(path, header=None, names=list(header), **options)
+
+
+def canonical_field(value):
+    # Collapse embedded line breaks so every record fits on one physical line
+    return " ".join(value.splitlines()) if ("\n" in value or "\r" in value) else value
+
+
+def normalise(src, dst, on_error=None):
+    """Write src to dst in canonical single-line form; returns the row count.
+
+    dst may be the same path as src: output goes to a temporary file first.
+    """
+    directory = os.path.dirname(os.path.abspath(dst))
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    rows = 0
+    try:
+        with os.fdopen(fd, "w", newline="", encoding="utf-8") as out:
+            writer = csv.writer(out, lineterminator="\n")
+            for _, row in iter_rows(src, on_error):
+                writer.writerow([canonical_field(v) for v in row])
+                rows += 1
+        os.replace(tmp, dst)
+    except BaseException:
+        os.remove(tmp)
+        raise
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Read or normalise an RFC 4180 CSV file")
+    parser.add_argument("csv")
+    parser.add_argument("--normalise", action="store_true",
+                        help="rewrite into canonical single-line form")
+    parser.add_argument("-o", "--output", help="output path for --normalise (default: stdout)")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.normalise and args.output:
+            rows = normalise(args.csv, args.output)
+            print(f"Wrote {rows} rows to {args.output}")
+        else:
+            writer = csv.writer(sys.stdout, lineterminator="\n")
+            for _, row in iter_rows(args.csv):
+                writer.writerow([canonical_field(v) for v in row] if args.normalise else row)
+    except CSVFormatError as e:
+        print(f"{args.csv}: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
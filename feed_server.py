@@ -0,0 +1,112 @@
+"""Local stand-in for the upstream model feeds, serving canned JSON.
+
+Every feed in ingest.ADAPTERS is served at its adapter path in that feed's
+payload format. Payloads come from JSON files in --from-dir if given,
+otherwise from the models currently live in model_list.csv, so a refresh
+against an unchanged stand-in produces no new events. --delay and --fail
+simulate slow and flaky sources. Responses carry an ETag and Last-Modified
+and conditional requests get a 304, like a well-behaved upstream.
+
+    python feed_server.py --port 8765 --delay 0.5 --fail 1
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import sys
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+from asof import STAMP_FORMAT, IntervalIndex
+from csv_reader import read_header
+from ingest import ADAPTERS, _require_aiohttp
+
+try:
+    from aiohttp import web
+except ImportError:  # optional dependency, like in ingest.py
+    web = None
+
+
+def canned_payloads(csv_path="model_list.csv", headers="model_list_headers.csv"):
+    # The models live now in the log, grouped by feed and encoded per adapter
+    header = read_header(headers)
+    column = {name: i for i, name in enumerate(header)}
+    listings = {source: [] for source in ADAPTERS}
+    if os.path.exists(csv_path):
+        for row in IntervalIndex.from_csv(csv_path, header).as_of(datetime.now().strftime(STAMP_FORMAT)):
+            source = row[column["source"]]
+            if source in listings:
+                listings[source].append({"model_name": row[column["model_name"]],
+                                         "comments": row[column["comments"]]})
+    return {cls.path: cls.encode(listings[source]) for source, cls in ADAPTERS.items()}
+
+
+def load_payloads(directory):
+    payloads = {}
+    for cls in ADAPTERS.values():
+        path = os.path.join(directory, cls.path)
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                payloads[cls.path] = json.load(f)
+    return payloads
+
+
+def make_app(payloads, delay=0.0, fail=0):
+    """aiohttp application serving payloads; the first `fail` requests per path get a 503."""
+    _require_aiohttp()
+    failures = {path: fail for path in payloads}
+    bodies = {path: json.dumps(payload).encode("utf-8") for path, payload in payloads.items()}
+    etags = {path: '"%s"' % hashlib.sha256(body).hexdigest()[:16] for path, body in bodies.items()}
+    # Payloads are fixed for the server's lifetime; HTTP dates have second precision
+    modified = datetime.now(timezone.utc).replace(microsecond=0)
+
+    def not_modified(request, path):
+        if "If-None-Match" in request.headers:
+            return etags[path] in request.headers["If-None-Match"]
+        since = request.headers.get("If-Modified-Since")
+        if since:
+            try:
+                return parsedate_to_datetime(since) >= modified
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    async def handle(request):
+        path = request.match_info["path"]
+        if path not in payloads:
+            raise web.HTTPNotFound()
+        await asyncio.sleep(delay)
+        if failures[path] > 0:
+            failures[path] -= 1
+            raise web.HTTPServiceUnavailable()
+        headers = {"ETag": etags[path], "Last-Modified": format_datetime(modified, usegmt=True)}
+        if not_modified(request, path):
+            return web.Response(status=304, headers=headers)
+        return web.Response(body=bodies[path], content_type="application/json", headers=headers)
+
+    app = web.Application()
+    app.router.add_get("/{path:.+}", handle)
+    return app
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve canned model feeds for ingest.py")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--from-dir", metavar="DIR", help="serve DIR/<adapter path> JSON files instead")
+    parser.add_argument("--csv", default="model_list.csv")
+    parser.add_argument("--headers", default="model_list_headers.csv")
+    parser.add_argument("--delay", type=float, default=0.0, help="seconds before each response")
+    parser.add_argument("--fail", type=int, default=0, help="answer the first N requests per feed with 503")
+    args = parser.parse_args(argv)
+
+    payloads = load_payloads(args.from_dir) if args.from_dir else canned_payloads(args.csv, args.headers)
+    for path in payloads:
+        print(f"- http://{args.host}:{args.port}/{path}")
+    web.run_app(make_app(payloads, args.delay, args.fail), host=args.host, port=args.port, print=None)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
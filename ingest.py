@@ -0,0 +1,327 @@
+"""Concurrent ingest of the upstream model feeds into model_list.csv.
+
+Each feed has an adapter that knows its URL path and payload format. All
+feeds are fetched at once over one pooled aiohttp session, each with its
+own timeout and retries, so a refresh takes as long as the slowest feed
+rather than the sum of them. Each listing is compared with the models
+model_list.csv currently shows as live for that feed, and the differences
+become Added/Removed rows in the event log schema.
+
+Responses are cached on disk per feed with their ETag and Last-Modified
+validators. Later fetches are conditional, and a 304 reuses the cached
+parsed listing, so an unchanged feed costs one round trip and no parsing.
+
+    python feed_server.py &                          # local stand-in with canned JSON
+    python ingest.py --base-url http://127.0.0.1:8765/ -o new_events.csv
+    python ingest.py --base-url http://127.0.0.1:8765/ --update
+"""
+import argparse
+import asyncio
+import csv
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+from urllib.parse import urljoin
+
+from asof import STAMP_FORMAT, IntervalIndex
+from csv_reader import read_header
+
+try:
+    import aiohttp
+except ImportError:  # optional dependency, only needed for fetching
+    aiohttp = None
+
+DEFAULT_BASE_URL = "http://127.0.0.1:8765/"
+DEFAULT_CACHE_DIR = ".feed_cache"
+# Server errors worth retrying; anything else in 4xx/5xx fails the feed at once
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def _require_aiohttp():
+    if aiohttp is None:
+        raise ImportError("aiohttp is required for ingest: pip install aiohttp")
+
+
+class FeedError(Exception):
+    pass
+
+
+class ResponseCache:
+    """Validators and parsed listing of the last 200 response, one JSON file per feed."""
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR):
+        self.directory = directory
+
+    def _path(self, source):
+        return os.path.join(self.directory, re.sub(r"[^A-Za-z0-9_.-]+", "_", source) + ".json")
+
+    def get(self, source, url):
+        # Entries for another URL are stale: the feed has moved
+        try:
+            with open(self._path(source), encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return entry if entry.get("url") == url else None
+
+    def put(self, source, url, etag, last_modified, listings):
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"url": url, "etag": etag, "last_modified": last_modified, "listings": listings}, f)
+        os.replace(tmp, self._path(source))
+
+
+class FeedAdapter:
+    """Fetch one feed and parse its payload into {model_name, comments} listings."""
+
+    source = None
+    path = None
+
+    def __init__(self, url, timeout=10.0, retries=2, backoff=0.5):
+        self.url = url
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.not_modified = False
+
+    async def fetch(self, session, headers=None):
+        """Return (status, response headers, payload); payload is None on a 304."""
+        # Retries with exponential backoff on timeouts, connection errors and 5xx
+        error = None
+        for attempt in range(self.retries + 1):
+            if attempt:
+                await asyncio.sleep(self.backoff * 2 ** (attempt - 1))
+            try:
+                async with session.get(self.url, headers=headers,
+                                       timeout=aiohttp.ClientTimeout(total=self.timeout)) as resp:
+                    if resp.status == 200:
+                        return resp.status, resp.headers, await resp.json(content_type=None)
+                    if resp.status == 304 and headers:
+                        return resp.status, resp.headers, None
+                    error = FeedError(f"{self.source}: HTTP {resp.status} from {self.url}")
+                    if resp.status not in RETRY_STATUSES:
+                        raise error
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                error = FeedError(f"{self.source}: {str(e) or type(e).__name__} from {self.url}")
+        raise error
+
+    async def listings(self, session, cache=None):
+        entry = cache.get(self.source, self.url) if cache is not None else None
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+        status, response_headers, payload = await self.fetch(session, headers)
+        self.not_modified = status == 304
+        if self.not_modified:
+            return entry["listings"]
+
+        listings = self.parse(payload)
+        if cache is not None:
+            cache.put(self.source, self.url, response_headers.get("ETag"),
+                      response_headers.get("Last-Modified"), listings)
+        return listings
+
+    def parse(self, payload):
+        return [{"model_name": m["name"], "comments": m.get("description", "")}
+                for m in payload.get("models", [])]
+
+    @classmethod
+    def encode(cls, listings):
+        # Inverse of parse(); builds canned payloads for the stand-in server
+        return {"models": [{"name": m["model_name"], "description": m["comments"]} for m in listings]}
+
+
+class ArenaAdapter(FeedAdapter):
+    source = "Arena Models"
+    path = "arena/models.json"
+
+
+class GeminiAdapter(FeedAdapter):
+    # Google's models.list format: {"models": [{"name": "models/<id>", ...}]}
+    source = "Gemini Models"
+    path = "gemini/models.json"
+
+    def parse(self, payload):
+        return [{"model_name": m["name"].removeprefix("models/"), "comments": m.get("description", "")}
+                for m in payload.get("models", [])]
+
+    @classmethod
+    def encode(cls, listings):
+        return {"models": [{"name": f"models/{m['model_name']}", "description": m["comments"]} for m in listings]}
+
+
+class OpenAIAdapter(FeedAdapter):
+    # OpenAI's /v1/models format: {"object": "list", "data": [{"id": ...}]}
+    source = "OpenAI Models"
+    path = "openai/models.json"
+
+    def parse(self, payload):
+        return [{"model_name": m["id"], "comments": ""} for m in payload.get("data", [])]
+
+    @classmethod
+    def encode(cls, listings):
+        return {"object": "list", "data": [{"id": m["model_name"], "object": "model"} for m in listings]}
+
+
+class DiscoveryAdapter(FeedAdapter):
+    source = "Discovery Tool"
+    path = "discovery/models.json"
+
+    def parse(self, payload):
+        return [{"model_name": m["id"], "comments": f"ID: {m['id']}; Provider: {m.get('provider', '')}"}
+                for m in payload.get("models", [])]
+
+    @classmethod
+    def encode(cls, listings):
+        models = []
+        for m in listings:
+            provider = m["comments"].partition("Provider: ")[2]
+            models.append({"id": m["model_name"], "provider": provider})
+        return {"models": models}
+
+
+class InternalAdapter(FeedAdapter):
+    source = "Internal Models"
+    path = "internal/models.json"
+
+    def parse(self, payload):
+        return [{"model_name": m["displayName"], "comments": m.get("description", "")}
+                for m in payload.get("models", [])]
+
+    @classmethod
+    def encode(cls, listings):
+        return {"models": [{"displayName": m["model_name"], "description": m["comments"]} for m in listings]}
+
+
+ADAPTERS = {cls.source: cls for cls in
+            (ArenaAdapter, GeminiAdapter, OpenAIAdapter, DiscoveryAdapter, InternalAdapter)}
+
+
+def build_adapters(base_url=DEFAULT_BASE_URL, config=None):
+    """Create one adapter per feed; config maps source -> {url, timeout, retries} overrides."""
+    config = config or {}
+    adapters = []
+    for source, cls in ADAPTERS.items():
+        options = dict(config.get(source, {}))
+        url = options.pop("url", urljoin(base_url, cls.path))
+        adapters.append(cls(url, **options))
+    return adapters
+
+
+async def fetch_all(adapters, limit=10, cache=None):
+    """Fetch every feed concurrently; returns source -> listings or the exception raised."""
+    _require_aiohttp()
+    connector = aiohttp.TCPConnector(limit=limit)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        results = await asyncio.gather(*(a.listings(session, cache) for a in adapters), return_exceptions=True)
+    return {a.source: result for a, result in zip(adapters, results)}
+
+
+def diff_events(listings, live, header, stamp):
+    """Turn feed listings into event rows in header order.
+
+    live is the set of (model_name, source) currently live in the log. Only
+    feeds present in listings are compared, so a failed feed never reads as
+    every one of its models being removed.
+    """
+    day, clock = stamp.split(" ")
+    rows = []
+    for source in sorted(listings):
+        listed = {m["model_name"]: m["comments"] for m in listings[source]}
+        was_live = {name for name, feed in live if feed == source}
+        for name in sorted(set(listed) - was_live):
+            rows.append({"model_name": name, "source": source, "date": day, "time": clock,
+                         "status": "Added", "comments": listed[name]})
+        for name in sorted(was_live - set(listed)):
+            rows.append({"model_name": name, "source": source, "date": day, "time": clock,
+                         "status": "Removed", "comments": ""})
+    return [[row.get(column, "") for column in header] for row in rows]
+
+
+def prepend_rows(path, rows):
+    # The published log is newest-first, so new events go at the top
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", newline="", encoding="utf-8") as out:
+            csv.writer(out, lineterminator="\n").writerows(rows)
+            if os.path.exists(path):
+                with open(path, encoding="utf-8", newline="") as f:
+                    # Copied in blocks; the log can be millions of rows
+                    shutil.copyfileobj(f, out)
+        os.replace(tmp, path)
+    except BaseException:
+        os.remove(tmp)
+        raise
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fetch every model feed and emit Added/Removed events")
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL, help=f"feed server root (default: {DEFAULT_BASE_URL})")
+    parser.add_argument("--feeds", metavar="JSON", help="per-feed overrides: source -> {url, timeout, retries}")
+    parser.add_argument("--csv", default="model_list.csv")
+    parser.add_argument("--headers", default="model_list_headers.csv")
+    parser.add_argument("--connections", type=int, default=10, help="connection pool size (default: 10)")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR,
+                        help=f"response cache for conditional requests (default: {DEFAULT_CACHE_DIR})")
+    parser.add_argument("--no-cache", action="store_true", help="always fetch and parse every feed in full")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("-o", "--output", help="write new events to this CSV (default: stdout)")
+    target.add_argument("--update", action="store_true", help="prepend new events to --csv")
+    args = parser.parse_args(argv)
+
+    config = None
+    if args.feeds:
+        with open(args.feeds, encoding="utf-8") as f:
+            config = json.load(f)
+
+    adapters = build_adapters(args.base_url, config)
+    cache = None if args.no_cache else ResponseCache(args.cache_dir)
+    start = time.perf_counter()
+    results = asyncio.run(fetch_all(adapters, args.connections, cache))
+    elapsed = time.perf_counter() - start
+
+    listings = {}
+    for adapter in adapters:
+        result = results[adapter.source]
+        if isinstance(result, Exception):
+            print(f"- {adapter.source}: failed ({result})", file=sys.stderr)
+        else:
+            listings[adapter.source] = result
+            note = " (not modified, cached)" if adapter.not_modified else ""
+            print(f"- {adapter.source}: {len(result)} models{note}", file=sys.stderr)
+    print(f"Fetched {len(listings)}/{len(results)} feeds in {elapsed:.2f}s", file=sys.stderr)
+
+    header = read_header(args.headers)
+    stamp = datetime.now().strftime(STAMP_FORMAT)
+    live = set()
+    if os.path.exists(args.csv):
+        live = {(row[header.index("model_name")], row[header.index("source")])
+                for row in IntervalIndex.from_csv(args.csv, header).as_of(stamp)}
+    rows = diff_events(listings, live, header, stamp)
+
+    if args.update:
+        if rows:
+            prepend_rows(args.csv, rows)
+        print(f"{len(rows)} new event(s) written to {args.csv}", file=sys.stderr)
+    else:
+        out = open(args.output, "w", newline="", encoding="utf-8") if args.output else sys.stdout
+        try:
+            csv.writer(out, lineterminator="\n").writerows(rows)
+        finally:
+            if out is not sys.stdout:
+                out.close()
+    return 0 if listings or not results else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+"""Provider ("ai_tab") classification for the whole catalogue in one pass.
+
+The rules table maps a provider label to the substrings that identify it in
+a model name. Rules are checked in order, like extractProvider() in app.js:
+the first rule with any matching substring wins, and names matching no rule
+fall back to the row's source.
+"""
+import json
+import re
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_RULES = {
+    "GPT": ["gpt", "chatgpt"],
+    "Claude": ["claude"],
+    "Gemini": ["gemini", "bard"],
+    "LLaMA": ["llama"],
+    "Mistral": ["mistral", "mixtral"],
+    "Command": ["command"],
+    "DeepSeek": ["deepseek"],
+    "Yi": ["yi"],
+    "PaLM": ["palm"],
+}
+
+
+def load_rules(path):
+    # JSON object of provider -> list of substrings; key order is rule priority
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compile_rules(rules):
+    # One anchored alternation with a group per rule. The regex engine tries the
+    # alternatives in order, so the first rule that matches anywhere in the
+    # name is the one that captures, preserving rule priority.
+    branches = [
+        ".*?(" + "|".join(re.escape(p.lower()) for p in patterns) + ")"
+        for patterns in rules.values()
+    ]
+    return re.compile("^(?:" + "|".join(branches) + ")", re.DOTALL)
+
+
+class ProviderClassifier:
+    def __init__(self, rules=None, fallback="Other"):
+        self.rules = dict(rules or DEFAULT_RULES)
+        self.labels = np.array(list(self.rules), dtype=object)
+        self.pattern = compile_rules(self.rules)
+        self.fallback = fallback
+
+    def classify(self, df):
+        """Return the provider label for every row of df as a Series."""
+        # Classify each distinct name once; event logs repeat names heavily
+        codes, uniques = pd.factorize(df["model_name"].fillna("").astype(str).str.lower())
+        matched = pd.Series(uniques).str.extract(self.pattern).notna().to_numpy()
+        hit = matched.any(axis=1)
+        unique_labels = np.where(hit, self.labels[matched.argmax(axis=1)], None)
+        labels = unique_labels[codes] if len(unique_labels) else np.empty(len(df), dtype=object)
+
+        if "source" in df:
+            fallback = df["source"].fillna(self.fallback).replace("", self.fallback).to_numpy(dtype=object)
+        else:
+            fallback = np.full(len(df), self.fallback, dtype=object)
+        return pd.Series(np.where(pd.isna(labels), fallback, labels), index=df.index, dtype=object)
+
+
+_default = None
+
+
+def classify_providers(df, rules=None):
+    global _default
+    if rules is not None:
+        return ProviderClassifier(rules).classify(df)
+    if _default is None:
+        _default = ProviderClassifier()
+    return _default.classify(df)
@@ -0,0 +1,273 @@
+"""Read-only JSON query API over model_list.csv.
+
+The catalogue is loaded once into in-memory indexes: row sets per source
+and status, and row positions sorted by date, by name and by every other
+column. Date ranges and name prefixes are binary searches. A query
+intersects the matching row sets and orders them by their precomputed rank
+in the requested sort, so serving a 50-row page never re-reads or re-sorts
+the file. The data is reloaded when last-updated.txt changes.
+
+    python query_server.py --port 8000
+    curl 'http://127.0.0.1:8000/models?source=OpenAI%20Models&status=Added&sort=date&order=desc&per_page=50'
+    curl 'http://127.0.0.1:8000/models?prefix=gemini&from=2025-06-10&to=2025-06-12&page=2'
+    curl 'http://127.0.0.1:8000/meta'
+
+Only the standard library is used.
+"""
+import argparse
+import json
+import sys
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from csv_reader import CSVFormatError, iter_rows, read_header
+
+DEFAULT_PER_PAGE = 50
+MAX_PER_PAGE = 500
+# Seconds between checks of last-updated.txt
+RELOAD_INTERVAL = 1.0
+
+
+class Catalogue:
+    """Immutable indexed view of one version of the catalogue."""
+
+    def __init__(self, header, rows, version=None):
+        self.header = list(header)
+        self.rows = rows
+        self.version = version
+        column = {name: i for i, name in enumerate(self.header)}
+        self.date_col = next((column[c] for c in ("date", "release_date") if c in column), None)
+        self.name_col = column["model_name"]
+
+        self.by_value = {}
+        for name in ("source", "status"):
+            if name in column:
+                index = {}
+                for pos, row in enumerate(rows):
+                    index.setdefault(row[column[name]], set()).add(pos)
+                self.by_value[name] = index
+
+        # One sort order per column; ties fall back to file order
+        self.orders = {}
+        for name, i in column.items():
+            if name == "time" and self.date_col is not None:
+                continue
+            key = self._sort_key(i, column.get("time") if i == self.date_col else None)
+            self.orders[name] = sorted(range(len(rows)), key=key)
+        # Position of each row within each order, for sorting small result sets directly
+        self.ranks = {}
+        for name, order in self.orders.items():
+            rank = [0] * len(rows)
+            for r, pos in enumerate(order):
+                rank[pos] = r
+            self.ranks[name] = rank
+
+        self.lower_names = [rows[pos][self.name_col].lower() for pos in self.orders["model_name"]]
+        if self.date_col is not None:
+            self.dates = [rows[pos][self.date_col] for pos in self.orders[self.header[self.date_col]]]
+
+    def _sort_key(self, i, time_col):
+        rows = self.rows
+        if time_col is not None:
+            return lambda pos: (rows[pos][i], rows[pos][time_col])
+        if i == self.name_col:
+            return lambda pos: rows[pos][i].lower()
+        return lambda pos: rows[pos][i]
+
+    @classmethod
+    def load(cls, path, headers, version=None):
+        header = read_header(headers)
+        rows = []
+        for _, row in iter_rows(path):
+            if not rows and row == header:
+                continue
+            if len(row) == len(header):
+                rows.append(row)
+        return cls(header, rows, version)
+
+    def _prefix_rows(self, prefix):
+        prefix = prefix.lower()
+        order = self.orders["model_name"]
+        lo = bisect_left(self.lower_names, prefix)
+        hi = bisect_left(self.lower_names, prefix + "\uffff")
+        return set(order[lo:hi])
+
+    def _date_rows(self, start, end):
+        order = self.orders[self.header[self.date_col]]
+        lo = bisect_left(self.dates, start) if start else 0
+        hi = bisect_right(self.dates, end) if end else len(self.dates)
+        return set(order[lo:hi])
+
+    def query(self, source=None, status=None, start=None, end=None, prefix=None,
+              sort=None, descending=False, page=1, per_page=DEFAULT_PER_PAGE):
+        """Return (total matches, rows on the requested page as dicts)."""
+        candidates = []
+        for name, value in (("source", source), ("status", status)):
+            if value is not None:
+                candidates.append(self.by_value.get(name, {}).get(value, set()))
+        if (start or end) and self.date_col is not None:
+            candidates.append(self._date_rows(start, end))
+        if prefix:
+            candidates.append(self._prefix_rows(prefix))
+
+        sort = sort or self.header[self.name_col if self.date_col is None else self.date_col]
+        skip = (page - 1) * per_page
+
+        if not candidates:
+            order = self.orders[sort]
+            total = len(order)
+            if descending:
+                # Read the page from the end instead of reversing the whole order
+                end = max(total - skip, 0)
+                positions = order[max(end - per_page, 0):end][::-1]
+            else:
+                positions = order[skip:skip + per_page]
+        else:
+            matches = set.intersection(*sorted(candidates, key=len))
+            total = len(matches)
+            ranked = sorted(matches, key=self.ranks[sort].__getitem__, reverse=descending)
+            positions = ranked[skip:skip + per_page]
+        return total, [dict(zip(self.header, self.rows[pos])) for pos in positions]
+
+    def meta(self):
+        return {
+            "version": self.version,
+            "rows": len(self.rows),
+            "columns": self.header,
+            "sort": sorted(self.orders),
+            "sources": sorted(self.by_value.get("source", {})),
+            "statuses": sorted(self.by_value.get("status", {})),
+        }
+
+
+class CatalogueStore:
+    """Holds the current Catalogue and swaps in a new one when last-updated.txt changes."""
+
+    def __init__(self, csv_path, headers, stamp_path="last-updated.txt"):
+        self.csv_path = csv_path
+        self.headers = headers
+        self.stamp_path = stamp_path
+        self.lock = threading.Lock()
+        self.checked = 0.0
+        self.stamp = None
+        self.catalogue = None
+        self.reload()
+
+    def _read_stamp(self):
+        try:
+            with open(self.stamp_path, encoding="utf-8") as f:
+                return f.read().strip()
+        except OSError:
+            return None
+
+    def reload(self):
+        stamp = self._read_stamp()
+        catalogue = Catalogue.load(self.csv_path, self.headers, stamp)
+        # Readers keep using the old catalogue until the new one is fully built
+        self.catalogue, self.stamp = catalogue, stamp
+
+    def current(self, now):
+        if now - self.checked >= RELOAD_INTERVAL:
+            with self.lock:
+                if now - self.checked >= RELOAD_INTERVAL:
+                    self.checked = now
+                    if self._read_stamp() != self.stamp:
+                        try:
+                            self.reload()
+                        except (OSError, CSVFormatError) as e:
+                            # Possibly caught mid-write; keep serving the old data and retry
+                            print(f"Reload of {self.csv_path} failed: {e}", file=sys.stderr)
+        return self.catalogue
+
+
+def parse_query(params, catalogue):
+    """Turn query-string parameters into Catalogue.query() arguments, or raise ValueError."""
+    def single(name):
+        values = params.get(name)
+        return values[-1] if values else None
+
+    sort = single("sort")
+    if sort is not None and sort not in catalogue.orders:
+        raise ValueError(f"cannot sort by {sort!r}, expected one of {sorted(catalogue.orders)}")
+    order = single("order") or "asc"
+    if order not in ("asc", "desc"):
+        raise ValueError("order must be asc or desc")
+    try:
+        page = int(single("page") or 1)
+        per_page = int(single("per_page") or DEFAULT_PER_PAGE)
+    except ValueError:
+        raise ValueError("page and per_page must be integers") from None
+    if page < 1 or not 1 <= per_page <= MAX_PER_PAGE:
+        raise ValueError(f"page must be >= 1 and per_page between 1 and {MAX_PER_PAGE}")
+    return {
+        "source": single("source"), "status": single("status"),
+        "start": single("from"), "end": single("to"), "prefix": single("prefix"),
+        "sort": sort, "descending": order == "desc", "page": page, "per_page": per_page,
+    }
+
+
+def make_handler(store):
+    class QueryHandler(BaseHTTPRequestHandler):
+        def _send(self, status, body):
+            data = json.dumps(body, separators=(",", ":")).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            # The dashboard may be served from another origin
+            self.send_header("Access-Control-Allow-Origin", "*")
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            catalogue = store.current(time.monotonic())
+            if url.path == "/meta":
+                return self._send(200, catalogue.meta())
+            if url.path != "/models":
+                return self._send(404, {"error": f"unknown endpoint {url.path}, expected /models or /meta"})
+            try:
+                args = parse_query(parse_qs(url.query), catalogue)
+            except ValueError as e:
+                return self._send(400, {"error": str(e)})
+            total, models = catalogue.query(**args)
+            self._send(200, {
+                "version": catalogue.version,
+                "total": total,
+                "page": args["page"],
+                "per_page": args["per_page"],
+                "pages": (total + args["per_page"] - 1) // args["per_page"],
+                "models": models,
+            })
+
+        def log_message(self, format, *args):
+            pass
+
+    return QueryHandler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve paginated JSON queries over model_list.csv")
+    parser.add_argument("--csv", default="model_list.csv")
+    parser.add_argument("--headers", default="model_list_headers.csv",
+                        help="CSV whose first row is the header (used when the file has none)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args(argv)
+
+    store = CatalogueStore(args.csv, args.headers)
+    print(f"Serving {len(store.catalogue.rows)} rows from {args.csv} on http://{args.host}:{args.port}/models")
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(store))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
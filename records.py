@@ -0,0 +1,322 @@
+"""Compact, typed in-memory representation of catalogue rows.
+
+Rows are stored column-wise in `array` buffers instead of as dicts or
+pandas object columns:
+
+- low-cardinality text (source, status, ai_tab, parameters, ...) is
+  dictionary encoded: each distinct string is kept once and rows hold
+  integer codes (2 bytes for source/status/ai_tab, 4 bytes otherwise)
+- near-unique text (model_name, comments) is packed into one UTF-8 buffer
+  with an 8-byte offset per row, so there is no per-string object overhead
+- date/time columns become one int64 of seconds since the epoch
+- parameters also get a parsed parameter_count (int64) next to the text;
+  cost_per_1k_tokens is float64 and context_length int64, with NaN /
+  NULL_INT for unknown values
+
+Every row round-trips to its original CSV strings. Cells whose typed value
+would not reproduce the text ("07:57", "1e-4", an unparseable date) keep the
+original in a sparse overrides map.
+
+An event log row costs about 28 bytes plus the length of its name and
+comment; the synthetic 1M-row log measures ~60 MB, so ~0.6 GB at 10M rows
+(nbytes() reports the same figure). Columns can be viewed as NumPy arrays
+without copying.
+
+    table = RecordTable.from_csv("model_list.csv", read_header("model_list_headers.csv"))
+    for record in table:
+        record.model_name, record.source, record.updated
+"""
+import math
+import re
+import sys
+from array import array
+from datetime import datetime, timezone
+
+from csv_reader import iter_rows
+
+NULL_INT = -2 ** 63
+SMALL_DICTIONARIES = {"source", "status", "ai_tab"}
+STRING_COLUMNS = {"model_name", "comments"}
+FLOAT_COLUMNS = {"cost_per_1k_tokens"}
+INT_COLUMNS = {"context_length", "parameter_count"}
+STAMP_COLUMNS = {"updated", "date", "release_date"}
+PARAMETER_RE = re.compile(r"^\s*([0-9]*\.?[0-9]+)\s*([KMBT]?)\s*$", re.IGNORECASE)
+PARAMETER_SCALE = {"": 1, "K": 1e3, "M": 1e6, "B": 1e9, "T": 1e12}
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def parse_parameters(text):
+    """Parameter count of "1.76T", "46.7B", "7B" etc. as a float; NaN when unknown."""
+    match = PARAMETER_RE.match(text or "")
+    if match is None:
+        return math.nan
+    return float(match.group(1)) * PARAMETER_SCALE[match.group(2).upper()]
+
+
+def parse_float(text):
+    try:
+        return float(text)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def parse_int(text):
+    try:
+        return int(text)
+    except (TypeError, ValueError):
+        return NULL_INT
+
+
+def parse_timestamp(day, clock=""):
+    # Seconds since the epoch (UTC) for a date and optional time; NULL_INT if unparseable
+    try:
+        stamp = datetime.fromisoformat(f"{day} {clock}".strip()).replace(tzinfo=timezone.utc)
+    except ValueError:
+        return NULL_INT
+    return int((stamp - EPOCH).total_seconds())
+
+
+def format_timestamp(seconds, with_time=True):
+    if seconds == NULL_INT:
+        return ""
+    stamp = datetime.fromtimestamp(seconds, timezone.utc)
+    return stamp.strftime("%Y-%m-%d %H:%M:%S" if with_time else "%Y-%m-%d")
+
+
+def _format_number(value):
+    if value == NULL_INT or (isinstance(value, float) and math.isnan(value)):
+        return ""
+    return str(value)
+
+
+class Dictionary:
+    """Bidirectional string <-> code mapping for one dictionary-encoded column."""
+
+    __slots__ = ("codes", "values")
+
+    def __init__(self):
+        self.codes = {}
+        self.values = []
+
+    def encode(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def nbytes(self):
+        return (sys.getsizeof(self.codes) + sys.getsizeof(self.values)
+                + sum(sys.getsizeof(v) for v in self.values))
+
+    def __len__(self):
+        return len(self.values)
+
+
+class StringColumn:
+    """Strings packed into one UTF-8 buffer, with row i at buffer[offsets[i]:offsets[i + 1]]."""
+
+    __slots__ = ("buffer", "offsets")
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.offsets = array("q", [0])
+
+    def append(self, value):
+        self.buffer += value.encode("utf-8")
+        self.offsets.append(len(self.buffer))
+
+    def __getitem__(self, i):
+        return self.buffer[self.offsets[i]:self.offsets[i + 1]].decode("utf-8")
+
+    def nbytes(self):
+        return len(self.buffer) + self.offsets.itemsize * len(self.offsets)
+
+
+class ModelRecord:
+    """Lightweight view of one row; attributes decode the table's columns on access."""
+
+    __slots__ = ("_table", "_row")
+
+    def __init__(self, table, row):
+        self._table = table
+        self._row = row
+
+    def __getattr__(self, name):
+        try:
+            return self._table.value(name, self._row)
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def as_dict(self):
+        return {name: self._table.value(name, self._row) for name in self._table.fields}
+
+    def __repr__(self):
+        return f"ModelRecord({self.as_dict()!r})"
+
+
+class RecordTable:
+    """Column-oriented table of catalogue rows backed by `array` buffers."""
+
+    def __init__(self, header):
+        self.header = list(header)
+        self.has_time = "date" in self.header and "time" in self.header
+        self.columns = {}
+        self.dictionaries = {}
+        self.strings = {}
+        # (column, row) -> original text, for the few cells the typed value cannot reproduce
+        self.overrides = {}
+        for name in self.header:
+            if name == "time" and self.has_time:
+                continue
+            if name in ("date", "release_date"):
+                self.columns[self._stamp_name(name)] = array("q")
+            elif name in FLOAT_COLUMNS:
+                self.columns[name] = array("d")
+            elif name in INT_COLUMNS:
+                self.columns[name] = array("q")
+            elif name in STRING_COLUMNS:
+                self.strings[name] = StringColumn()
+            else:
+                self.columns[name] = array("H" if name in SMALL_DICTIONARIES else "I")
+                self.dictionaries[name] = Dictionary()
+        # The parsed count sits next to the parameters text unless the file already has it
+        self.derive_count = "parameters" in self.header and "parameter_count" not in self.header
+        if self.derive_count:
+            self.columns["parameter_count"] = array("q")
+        self.fields = []
+        for name in self.header:
+            if name in ("date", "release_date"):
+                self.fields.append(self._stamp_name(name))
+            elif name in self.columns or name in self.strings:
+                self.fields.append(name)
+            if name == "parameters" and self.derive_count:
+                self.fields.append("parameter_count")
+        self._time_col = self.header.index("time") if self.has_time else None
+        self._rows = 0
+
+    def _stamp_name(self, name):
+        # The event log's date and time share one column
+        return "updated" if name == "date" and self.has_time else name
+
+    def _keep_text(self, name, text, formatted):
+        if formatted != text:
+            self.overrides[(name, self._rows)] = text
+
+    def append(self, row):
+        """Add one row given as a sequence in header order."""
+        for name, value in zip(self.header, row):
+            text = "" if value is None else str(value)
+            if name == "time" and self.has_time:
+                continue
+            if name in ("date", "release_date"):
+                clock = "" if self._time_col is None else row[self._time_col]
+                clock = "" if clock is None else str(clock)
+                stamp = parse_timestamp(text, clock)
+                self.columns[self._stamp_name(name)].append(stamp)
+                formatted = format_timestamp(stamp)
+                self._keep_text(name, text, formatted[:10])
+                if self.has_time and name == "date":
+                    self._keep_text("time", clock, formatted[11:])
+            elif name in FLOAT_COLUMNS:
+                number = value if isinstance(value, float) else parse_float(text)
+                self.columns[name].append(number)
+                self._keep_text(name, text, _format_number(number))
+            elif name in INT_COLUMNS:
+                number = parse_int(text)
+                self.columns[name].append(number)
+                self._keep_text(name, text, _format_number(number))
+            elif name in STRING_COLUMNS:
+                self.strings[name].append(text)
+            else:
+                self.columns[name].append(self.dictionaries[name].encode(text))
+                if name == "parameters" and self.derive_count:
+                    count = parse_parameters(text)
+                    self.columns["parameter_count"].append(NULL_INT if math.isnan(count) else round(count))
+        self._rows += 1
+
+    def extend(self, rows):
+        for row in rows:
+            self.append(row)
+        return self
+
+    @classmethod
+    def from_rows(cls, header, rows):
+        return cls(header).extend(rows)
+
+    @classmethod
+    def from_csv(cls, path, header):
+        """Load a CSV in one streaming pass; a leading header row is skipped."""
+        table = cls(header)
+        first = True
+        for _, row in iter_rows(path):
+            if first:
+                first = False
+                if row == list(header):
+                    continue
+            if len(row) == len(header):
+                table.append(row)
+        return table
+
+    @classmethod
+    def from_records(cls, records, header):
+        # Record dicts such as script.py's model_data
+        return cls(header).extend([record.get(name) for name in header] for record in records)
+
+    def value(self, name, row):
+        if name in self.strings:
+            return self.strings[name][row]
+        raw = self.columns[name][row]
+        if name in self.dictionaries:
+            return self.dictionaries[name].values[raw]
+        if name in INT_COLUMNS or name in STAMP_COLUMNS:
+            return None if raw == NULL_INT else raw
+        return None if math.isnan(raw) else raw
+
+    def row(self, i):
+        """Row i as strings in header order, exactly as it was read."""
+        out = []
+        overrides = self.overrides
+        for name in self.header:
+            if (name, i) in overrides:
+                out.append(overrides[(name, i)])
+            elif name == "time" and self.has_time:
+                out.append(format_timestamp(self.columns["updated"][i])[11:])
+            elif name in ("date", "release_date"):
+                out.append(format_timestamp(self.columns[self._stamp_name(name)][i])[:10])
+            elif name in FLOAT_COLUMNS or name in INT_COLUMNS:
+                out.append(_format_number(self.columns[name][i]))
+            else:
+                out.append(self.value(name, i))
+        return out
+
+    def numpy(self, name):
+        """Zero-copy NumPy view of a column's buffer (codes for dictionary columns)."""
+        import numpy as np  # only needed for vectorised consumers
+
+        if name in self.strings:
+            raise TypeError(f"{name} is a packed string column and has no numeric view")
+        return np.frombuffer(self.columns[name], dtype=self.columns[name].typecode)
+
+    def nbytes(self):
+        """Resident size: column buffers, packed strings, dictionaries and overrides."""
+        total = sum(col.itemsize * len(col) for col in self.columns.values())
+        total += sum(column.nbytes() for column in self.strings.values())
+        total += sum(d.nbytes() for d in self.dictionaries.values())
+        if self.overrides:
+            total += sys.getsizeof(self.overrides) + sum(
+                sys.getsizeof(key) + sys.getsizeof(key[1]) + sys.getsizeof(text)
+                for key, text in self.overrides.items())
+        return total
+
+    def __len__(self):
+        return self._rows
+
+    def __getitem__(self, i):
+        if not -self._rows <= i < self._rows:
+            raise IndexError(i)
+        return ModelRecord(self, i % self._rows)
+
+    def __iter__(self):
+        for i in range(self._rows):
+            yield ModelRecord(self, i)
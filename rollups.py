@@ -0,0 +1,152 @@
+"""Change-log rollups for the model_list.csv event log.
+
+model_list.csv records Added/Removed transitions. One streaming pass turns
+it into addition and removal counts per day, per ISO week and per source,
+plus the current state of each model in each feed, where the latest event
+wins. Feeds are independent, as in asof.py: a model Added by one feed and
+Removed by another is still live in the first. The result
+is written as JSON, or as one Parquet table per rollup, so the dashboard
+can chart history without replaying the log.
+
+    python rollups.py model_list.csv -o rollups.json
+    python rollups.py model_list.csv --parquet rollups/
+"""
+import argparse
+import json
+import os
+import sys
+from datetime import date
+
+from csv_reader import iter_rows, read_header
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional dependency, only needed for --parquet
+    pa = None
+
+EVENTS = {"Added": "added", "Removed": "removed"}
+
+
+def iso_week(day):
+    year, week, _ = date.fromisoformat(day).isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+class Rollup:
+    """Accumulate counts and current state from event rows in any order."""
+
+    def __init__(self):
+        self.by_day = {}
+        self.by_week = {}
+        self.by_source = {}
+        self.models = {}
+        self.events = 0
+
+    def _bump(self, table, key, event):
+        counts = table.get(key)
+        if counts is None:
+            counts = table[key] = {"added": 0, "removed": 0}
+        counts[event] += 1
+
+    def add(self, model_name, source, day, time, status):
+        self.events += 1
+        event = EVENTS.get(status)
+        if event is not None:
+            self._bump(self.by_day, day, event)
+            self._bump(self.by_week, iso_week(day), event)
+            self._bump(self.by_source, source, event)
+
+        # The log is not in time order, so compare timestamps; ties go to the later row
+        stamp = f"{day} {time}"
+        key = (model_name, source)
+        current = self.models.get(key)
+        if current is None or stamp >= current["updated"]:
+            self.models[key] = {"status": status, "updated": stamp}
+
+    def result(self):
+        live = sum(1 for state in self.models.values() if state["status"] != "Removed")
+        return {
+            "events": self.events,
+            "models": len(self.models),
+            "live": live,
+            "by_day": dict(sorted(self.by_day.items())),
+            "by_week": dict(sorted(self.by_week.items())),
+            "by_source": dict(sorted(self.by_source.items())),
+            "current": [{"model_name": name, "source": source, **state}
+                        for (name, source), state in sorted(self.models.items())],
+        }
+
+
+def rollup(path, header):
+    """Stream the event log at path once and return the rollup dict."""
+    column = {name: i for i, name in enumerate(header)}
+    missing = [c for c in ("model_name", "source", "date", "time", "status") if c not in column]
+    if missing:
+        raise ValueError(f"{path} has no {', '.join(missing)} column(s); rollups need the event log schema")
+    fields = [column[c] for c in ("model_name", "source", "date", "time", "status")]
+
+    result = Rollup()
+    first = True
+    for _, row in iter_rows(path):
+        if first:
+            first = False
+            # The published file is headerless, but a header row is allowed
+            if row == header:
+                continue
+        if len(row) != len(header):
+            continue
+        result.add(*(row[i] for i in fields))
+    return result.result()
+
+
+def write_json(result, path, version=None):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(dict(result, version=version), f, separators=(",", ":"))
+
+
+def write_parquet(result, out_dir):
+    """Write by_day, by_week, by_source and current as Parquet tables in out_dir."""
+    if pa is None:
+        raise ImportError("pyarrow is required for Parquet rollups: pip install pyarrow")
+    os.makedirs(out_dir, exist_ok=True)
+    for name, key in (("by_day", "day"), ("by_week", "week"), ("by_source", "source")):
+        table = result[name]
+        pq.write_table(pa.table({
+            key: list(table),
+            "added": [counts["added"] for counts in table.values()],
+            "removed": [counts["removed"] for counts in table.values()],
+        }), os.path.join(out_dir, f"{name}.parquet"))
+
+    current = result["current"]
+    pq.write_table(pa.table({
+        "model_name": [state["model_name"] for state in current],
+        "status": pa.array([state["status"] for state in current]).dictionary_encode(),
+        "source": pa.array([state["source"] for state in current]).dictionary_encode(),
+        "updated": [state["updated"] for state in current],
+    }), os.path.join(out_dir, "current.parquet"))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Roll up the model_list.csv change log")
+    parser.add_argument("csv", nargs="?", default="model_list.csv")
+    parser.add_argument("--headers", default="model_list_headers.csv",
+                        help="CSV whose first row is the event log header")
+    parser.add_argument("-o", "--output", default="rollups.json", help="JSON output (default: rollups.json)")
+    parser.add_argument("--parquet", metavar="DIR", help="also write one Parquet table per rollup to DIR")
+    args = parser.parse_args(argv)
+
+    result = rollup(args.csv, read_header(args.headers))
+    version = None
+    if os.path.exists("last-updated.txt"):
+        with open("last-updated.txt", encoding="utf-8") as f:
+            version = f.read().strip()
+    write_json(result, args.output, version)
+    if args.parquet:
+        write_parquet(result, args.parquet)
+    print(f"{result['events']} events, {result['models']} models ({result['live']} live) -> {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,22 @@
+import argparse
+import io
+import os
 import pandas as pd
 import json
-from datetime import datetime, timedelta
-import random
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import islice
+
+from canonical import Canonicaliser, canonical_view
+from costs import PARAMETER_COUNT, parameter_counts, prices
+from csv_reader import iter_rows, read_frame
+from providers import ProviderClassifier, load_rules
+from search_index import SearchIndexBuilder
+from shards import ShardWriter
+from snapshot import SnapshotWriter, read_headers
+from sqlite_store import SQLiteStore
+from stats import StatsBuilder
+from synthetic import generate_catalogue
 
 # Create sample model data that represents what might be in your CSV
 model_data = [
@@ -22,9 +37,6 @@ model_data = [
     {"model_name": "palm-2", "status": "Deprecated", "source": "Google", "release_date": "2023-05-10", "parameters": "540B", "context_length": 8000, "cost_per_1k_tokens": 0.001},
 ]
 
-# Create DataFrame
-df = pd.DataFrame(model_data)
-
 # Create headers with underscores (as the user mentioned)
 headers_data = {
     "model_name": "model_name",
@@ -32,23 +44,347 @@ headers_data = {
     "source": "source",
     "release_date": "release_date",
     "parameters": "parameters",
+    "parameter_count": "parameter_count",
     "context_length": "context_length",
-    "cost_per_1k_tokens": "cost_per_1k_tokens"
+    "cost_per_1k_tokens": "cost_per_1k_tokens",
+    "ai_tab": "ai_tab"
 }
 
-# Save the sample data files
-df.to_csv('model_list.csv', index=False)
-pd.DataFrame([headers_data]).to_csv('model_list_headers.csv', index=False)
-
-# Create last updated file
-with open('last-updated.txt', 'w') as f:
-    f.write(datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
-
-print("Sample files created:")
-print("- model_list.csv")
-print("- model_list_headers.csv") 
-print("- last-updated.txt")
-print(f"\nSample data shape: {df.shape}")
-print(f"Columns: {list(df.columns)}")
-print(f"\nFirst few rows:")
-print(df.head(3))
\ No newline at end of file
+# Assigns the ai_tab column; replaced in main() when --provider-rules is given
+provider_classifier = ProviderClassifier()
+
+# Rows per chunk in streaming mode; peak memory scales with this, not the catalogue size
+DEFAULT_CHUNK_SIZE = 50_000
+
+
+def iter_records(synthetic_rows=None, seed=0):
+    # Source records as an iterator - the hand-written sample, or a synthetic catalogue
+    if synthetic_rows is not None:
+        yield from generate_catalogue(synthetic_rows, seed)
+    else:
+        yield from model_data
+
+
+def prepare(df):
+    # Derived columns are computed once here so the dashboard doesn't have to
+    df['ai_tab'] = provider_classifier.classify(df)
+    # Typed numeric columns with empty (null) cells for unknown values, never 0.
+    # The event log rebuilt by --outputs-only has neither column.
+    if 'parameters' in df:
+        df[PARAMETER_COUNT] = parameter_counts(df['parameters']).round().astype('Int64')
+    if 'cost_per_1k_tokens' in df:
+        df['cost_per_1k_tokens'] = prices(df['cost_per_1k_tokens'])
+    return df
+
+
+def _init_worker(rules):
+    # Workers classify with the same rules as the parent, even when --provider-rules replaced them
+    global provider_classifier
+    provider_classifier = ProviderClassifier(rules)
+
+
+def prepare_parallel(df, pool):
+    # One task per source; reassembling by the original index keeps row order, so
+    # the CSV written afterwards is byte-identical to prepare(df)
+    if pool is None or 'source' not in df or df['source'].nunique(dropna=False) < 2:
+        return prepare(df)
+    futures = [pool.submit(prepare, part) for _, part in df.groupby('source', sort=False, dropna=False)]
+    return pd.concat([future.result() for future in futures]).reindex(df.index)
+
+
+def open_pool(workers):
+    if not workers or workers < 2:
+        return None
+    return ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(provider_classifier.rules,))
+
+
+def iter_chunks(records, chunk_size=DEFAULT_CHUNK_SIZE, pool=None, canonicaliser=None):
+    # Group an iterator of record dicts into DataFrames of at most chunk_size rows
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    records = iter(records)
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            return
+        chunk = prepare_parallel(pd.DataFrame(chunk, columns=list(headers_data)), pool)
+        # The canonicaliser's index spans chunks, so duplicates are dropped across the whole stream
+        yield canonicaliser.apply(chunk) if canonicaliser is not None else chunk
+
+
+def write_csv_streaming(records, path, chunk_size=DEFAULT_CHUNK_SIZE, sinks=(), pool=None, canonicaliser=None):
+    # Write records to CSV one chunk at a time, returning the row count
+    rows = 0
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        for chunk in iter_chunks(records, chunk_size, pool, canonicaliser):
+            chunk.to_csv(f, index=False, header=(rows == 0))
+            for sink in sinks:
+                sink.write(chunk)
+            rows += len(chunk)
+        if rows == 0:
+            pd.DataFrame(columns=list(headers_data)).to_csv(f, index=False)
+    return rows
+
+
+def key_columns(columns):
+    # Rows are identified by model name, plus the event timestamp when the log has one
+    return ['model_name'] + [c for c in ('date', 'time') if c in columns]
+
+
+def as_csv_text(df):
+    # Round-trip through CSV so values compare exactly as they are stored on disk
+    return read_frame(io.StringIO(df.to_csv(index=False)))
+
+
+def write_incremental(records, path, pool=None, canonicaliser=None):
+    # Append new rows and patch changed rows in place; returns counts for the run summary
+    columns = list(headers_data)
+    incoming = prepare_parallel(pd.DataFrame(list(records), columns=columns), pool)
+    if canonicaliser is not None:
+        incoming = canonicaliser.apply(incoming)
+    incoming = as_csv_text(incoming)
+    keys = key_columns(columns)
+    incoming = incoming.drop_duplicates(keys, keep='last').reset_index(drop=True)
+    summary = {'added': 0, 'patched': 0, 'unchanged': 0, 'rows_written': 0, 'total_rows': len(incoming)}
+
+    existing = None
+    if os.path.exists(path):
+        existing = read_frame(path)
+        if list(existing.columns) != columns:
+            print(f"Warning: {path} columns differ from headers, rewriting in full")
+            existing = None
+    if existing is None:
+        incoming.to_csv(path, index=False)
+        summary.update(added=len(incoming), rows_written=len(incoming))
+        return summary
+
+    positions = (existing.reset_index()
+                 .drop_duplicates(keys, keep='last')
+                 .set_index(keys)['index'])
+    matched = incoming.join(positions, on=keys)
+    is_new = matched['index'].isna()
+    added = incoming[is_new]
+    found = matched[~is_new]
+    rows = found['index'].astype(int).to_numpy()
+    changed = (existing.loc[rows, columns].to_numpy() != found[columns].to_numpy()).any(axis=1)
+
+    summary.update(added=len(added), patched=int(changed.sum()),
+                   unchanged=int((~changed).sum()), total_rows=len(existing) + len(added))
+    if summary['patched']:
+        existing.loc[rows[changed], columns] = found.loc[changed, columns].to_numpy()
+        pd.concat([existing, added], ignore_index=True).to_csv(path, index=False)
+        summary['rows_written'] = summary['total_rows']
+    elif len(added):
+        added.to_csv(path, mode='a', index=False, header=False)
+        summary['rows_written'] = len(added)
+    return summary
+
+
+def write_sqlite(records, db, path, chunk_size=DEFAULT_CHUNK_SIZE, pool=None, canonicaliser=None):
+    # Upsert records into the SQLite store, then export the CSV from it only if anything changed
+    columns = list(headers_data)
+    incoming = 0
+    with SQLiteStore(db, columns, key_columns(columns)) as store:
+        for chunk in iter_chunks(records, chunk_size, pool, canonicaliser):
+            store.write(chunk)
+            incoming += len(chunk)
+        summary = {'added': store.inserted, 'patched': store.updated,
+                   'unchanged': incoming - store.inserted - store.updated,
+                   'rows_written': 0, 'total_rows': store.count()}
+        if store.inserted or store.updated or not os.path.exists(path):
+            summary['rows_written'] = store.export_csv(path)
+    return summary
+
+
+def write_headers(path='model_list_headers.csv'):
+    pd.DataFrame([headers_data]).to_csv(path, index=False)
+
+
+def headers_current(path='model_list_headers.csv'):
+    if not os.path.exists(path):
+        return False
+    rows = iter_rows(path)
+    next(rows, None)  # header row
+    mapping = next(rows, None)
+    return mapping is not None and mapping[1] == list(headers_data.values())
+
+
+def write_last_updated(stamp, path='last-updated.txt'):
+    with open(path, 'w') as f:
+        f.write(stamp)
+
+
+def read_last_updated(path='last-updated.txt'):
+    with open(path) as f:
+        return f.read().strip()
+
+
+def open_sinks(args, version, columns=None):
+    # Extra outputs that are fed the same DataFrame chunks as model_list.csv
+    sinks = []
+    if args.snapshot:
+        sinks.append(SnapshotWriter(args.snapshot, read_headers()))
+    if args.stats:
+        sinks.append(StatsBuilder(args.stats, version))
+    if args.shards:
+        sinks.append(ShardWriter(args.shards, columns or list(headers_data), version))
+    if args.search_index:
+        sinks.append(SearchIndexBuilder(args.search_index, version))
+    return sinks
+
+
+def close_sinks(sinks):
+    for sink in sinks:
+        sink.close()
+
+
+def rebuild_outputs(args, outputs, path='model_list.csv'):
+    # Rebuild the extra outputs from the existing CSV (headerless or not), stamped with its
+    # last-updated.txt, without regenerating the data itself. The derived columns (ai_tab, with
+    # --provider-rules if given) are added exactly as for freshly generated rows.
+    df = read_frame(path, read_headers())
+    provider = None
+    if args.dedupe:
+        # What the dashboard loads gets the cross-feed view; the log itself stays per feed
+        view, dropped = canonical_view(df)
+        df = view[list(df.columns)].reset_index(drop=True)
+        provider = view['provider'].reset_index(drop=True)
+        print(f"Dedupe: {dropped} duplicate row(s) dropped across feeds and variants")
+    df = prepare(df)
+    if provider is not None and 'source' in df:
+        # A provider named in any feed's comment beats falling back to the row's source
+        fallback = (df['ai_tab'] == df['source']) & (provider != '')
+        df['ai_tab'] = df['ai_tab'].where(~fallback, provider)
+    version = read_last_updated()
+    sinks = open_sinks(args, version, list(df.columns))
+    for sink in sinks:
+        sink.write(df)
+    close_sinks(sinks)
+    print(f"Rebuilt from {path} ({len(df)} rows, version {version}):")
+    for output in outputs:
+        print(f"- {output}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate model_list.csv, model_list_headers.csv and last-updated.txt")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--stream', action='store_true',
+                      help="write model_list.csv in bounded chunks instead of building one DataFrame")
+    mode.add_argument('--incremental', action='store_true',
+                      help="only append or patch rows that changed in the existing model_list.csv")
+    mode.add_argument('--outputs-only', action='store_true',
+                      help="only rebuild --snapshot/--stats/--shards/--search-index from the existing "
+                           "model_list.csv and last-updated.txt")
+    mode.add_argument('--sqlite', metavar='DB',
+                      help="keep the catalogue in an SQLite database, upsert into it and export model_list.csv")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"rows per chunk in streaming mode (default: {DEFAULT_CHUNK_SIZE})")
+    parser.add_argument('--synthetic', type=int, metavar='ROWS',
+                        help="generate a synthetic catalogue of ROWS rows instead of the sample data")
+    parser.add_argument('--seed', type=int, default=0, help="random seed for --synthetic (default: 0)")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="process rows in parallel, one task per source, on this many processes (default: 1)")
+    parser.add_argument('--dedupe', action='store_true',
+                        help="drop rows repeating a model's previous status within the same source; with "
+                             "--outputs-only, collapse the outputs across feeds and variants (see canonical.py)")
+    parser.add_argument('--provider-rules', metavar='PATH',
+                        help="JSON rules table (provider -> name substrings) for the ai_tab column")
+    parser.add_argument('--snapshot', metavar='PATH',
+                        help="also write a typed columnar snapshot (.arrow or .parquet, needs pyarrow)")
+    parser.add_argument('--stats', nargs='?', const='stats.json', metavar='PATH',
+                        help="also write precomputed dashboard aggregates (default: stats.json)")
+    parser.add_argument('--shards', nargs='?', const='shards', metavar='DIR',
+                        help="also write pre-sorted views and per-source/per-status shards (default: shards/)")
+    parser.add_argument('--search-index', nargs='?', const='search_index.json', metavar='PATH',
+                        help="also write a trigram search index for the dashboard (default: search_index.json)")
+    args = parser.parse_args(argv)
+    if args.outputs_only and not (args.snapshot or args.stats or args.shards or args.search_index):
+        parser.error("--outputs-only needs at least one of --snapshot, --stats, --shards, --search-index")
+    return args
+
+
+def main(argv=None):
+    global provider_classifier
+    args = parse_args(argv)
+    if args.provider_rules:
+        provider_classifier = ProviderClassifier(load_rules(args.provider_rules))
+    stamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    outputs = [path for path in (args.snapshot, args.stats, args.shards, args.search_index) if path]
+
+    pool = open_pool(args.workers)
+    try:
+        return run(args, stamp, outputs, pool)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+
+def run(args, stamp, outputs, pool=None):
+    if args.outputs_only:
+        return rebuild_outputs(args, outputs)
+    canonicaliser = Canonicaliser() if args.dedupe else None
+    if args.incremental or args.sqlite:
+        records = iter_records(args.synthetic, args.seed)
+        if args.sqlite:
+            summary = write_sqlite(records, args.sqlite, 'model_list.csv', args.chunk_size, pool, canonicaliser)
+        else:
+            summary = write_incremental(records, 'model_list.csv', pool, canonicaliser)
+        changed = summary['added'] + summary['patched'] > 0
+        if not headers_current():
+            write_headers()
+            changed = True
+        if changed or not os.path.exists('last-updated.txt'):
+            write_last_updated(stamp)
+        if changed or not all(os.path.exists(path) for path in outputs):
+            sinks = open_sinks(args, stamp if changed else read_last_updated())
+            if sinks:
+                full = read_frame('model_list.csv')
+                for sink in sinks:
+                    sink.write(full)
+                close_sinks(sinks)
+
+        print(f"Incremental update of model_list.csv{' from ' + args.sqlite if args.sqlite else ''}:")
+        print(f"- {summary['added']} added, {summary['patched']} patched, {summary['unchanged']} unchanged")
+        print(f"- {summary['rows_written']} of {summary['total_rows']} rows written")
+        print(f"- last-updated.txt {'bumped' if changed else 'left as is (no changes)'}")
+        return
+
+    write_headers()
+    sinks = open_sinks(args, stamp)
+    if args.stream:
+        rows = write_csv_streaming(iter_records(args.synthetic, args.seed), 'model_list.csv',
+                                   args.chunk_size, sinks, pool, canonicaliser)
+    else:
+        # Create DataFrame
+        df = pd.DataFrame(list(iter_records(args.synthetic, args.seed)), columns=list(headers_data))
+        df = prepare_parallel(df, pool)
+        if canonicaliser is not None:
+            df = canonicaliser.apply(df).reset_index(drop=True)
+        df.to_csv('model_list.csv', index=False)
+        for sink in sinks:
+            sink.write(df)
+        rows = len(df)
+    close_sinks(sinks)
+    write_last_updated(stamp)
+
+    print("Sample files created:")
+    print("- model_list.csv")
+    print("- model_list_headers.csv") 
+    print("- last-updated.txt")
+    for path in outputs:
+        print(f"- {path}")
+    print(f"\nSample data shape: {(rows, len(headers_data))}")
+    print(f"Columns: {list(headers_data)}")
+    if canonicaliser is not None:
+        print(f"Dedupe: {canonicaliser.dropped} duplicate row(s) dropped")
+    if pool is not None:
+        print(f"Parallel mode: {args.workers} worker processes, one task per source")
+    if args.stream:
+        print(f"Streaming mode: chunk size {args.chunk_size}")
+    else:
+        print(f"\nFirst few rows:")
+        print(df.head(3))
+
+
+if __name__ == '__main__':
+    main()
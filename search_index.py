@@ -0,0 +1,102 @@
+"""Trigram search index over the catalogue (search_index.json).
+
+Each row's search text is built exactly like applyFilters() in app.js: the
+search fields joined with spaces and lowercased. Distinct texts become docs,
+and every trigram maps to the ids of the docs containing it. The posting
+lists are sorted, delta-encoded and packed into strings of base-32 varints
+(one character for gaps under 32) to keep the JSON small.
+
+The texts themselves are not shipped; the dashboard already has them in the
+rows it parsed. Each doc is stored as the CRC-32 of its UTF-8 text, which
+app.js recomputes per row to find the row's doc id, whatever order the rows
+arrive in. The dashboard intersects the posting lists of a query's trigrams
+and then confirms the substring match against the row's own text, so it only
+touches matching rows.
+"""
+import json
+import string
+import zlib
+
+import pandas as pd
+
+from providers import classify_providers
+
+# Same fields, in the same order, as the search filter in app.js
+SEARCH_FIELDS = ("model_name", "source", "ai_tab", "status", "parameters", "comments")
+# Varint digits: the first 32 end a number, the last 32 continue it (decoded in app.js)
+DIGITS = string.digits + string.ascii_uppercase + string.ascii_lowercase + "-_"
+
+
+def _field(df, name):
+    if name in df:
+        return df[name].fillna("").astype(str)
+    if name == "ai_tab":
+        # app.js fills in a missing ai_tab before searching, so the text must include it too
+        return classify_providers(df)
+    return pd.Series("", index=df.index)
+
+
+def search_text(df):
+    parts = [_field(df, f) for f in SEARCH_FIELDS]
+    text = parts[0]
+    for part in parts[1:]:
+        text = text + " " + part
+    return text.str.lower()
+
+
+def text_key(text):
+    # Same as crc32() in app.js
+    return zlib.crc32(text.encode("utf-8"))
+
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def delta_encode(ids):
+    return [ids[0]] + [b - a for a, b in zip(ids, ids[1:])] if ids else []
+
+
+def varint(n):
+    # Most significant 5 bits first
+    out = [DIGITS[n & 31]]
+    n >>= 5
+    while n:
+        out.append(DIGITS[32 + (n & 31)])
+        n >>= 5
+    return "".join(reversed(out))
+
+
+def pack_postings(ids):
+    return "".join(varint(delta) for delta in delta_encode(ids))
+
+
+class SearchIndexBuilder:
+    """Sink that indexes DataFrame chunks and writes the index as JSON."""
+
+    def __init__(self, path, version):
+        self.path = path
+        self.version = version
+        self.docs = {}
+        self.postings = {}
+
+    def write(self, df):
+        for text in search_text(df).unique():
+            if text in self.docs:
+                continue
+            doc_id = self.docs[text] = len(self.docs)
+            # Ids only grow, so each posting list stays sorted
+            for gram in trigrams(text):
+                self.postings.setdefault(gram, []).append(doc_id)
+
+    def result(self):
+        return {
+            "version": self.version,
+            "fields": list(SEARCH_FIELDS),
+            "keys": [text_key(text) for text in self.docs],
+            "trigrams": {gram: pack_postings(ids) for gram, ids in sorted(self.postings.items())},
+        }
+
+    def close(self):
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(self.result(), f, separators=(",", ":"), ensure_ascii=False)
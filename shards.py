@@ -0,0 +1,155 @@
+"""Pre-sorted views and per-source/per-status shards of model_list.csv.
+
+Layout written under the output directory:
+
+    manifest.json           version, columns, row counts and file paths
+    sorted/<view>.csv       whole catalogue sorted for a default table view
+    by_source/<value>.csv   rows for one source, newest first
+    by_status/<value>.csv   rows for one status, newest first
+
+Chunks are appended to the shard files as they arrive. On close each shard is
+sorted on its own and the sorted views are k-way merged from the source
+shards, so memory is bounded by the largest shard rather than the catalogue.
+"""
+import csv
+import heapq
+import json
+import os
+import re
+
+import pandas as pd
+
+SHARD_FIELDS = ("source", "status")
+
+
+def sort_views(columns):
+    # view name -> (sort columns, ascending); the first view is the default order
+    date_columns = [c for c in ("date", "time") if c in columns] or [c for c in ("release_date",) if c in columns]
+    views = {}
+    if date_columns:
+        views["date"] = (date_columns, False)
+    views["model_name"] = (["model_name"], True)
+    if "source" in columns:
+        views["source"] = (["source", "model_name"], True)
+    return views
+
+
+def _sort_key(series):
+    # Case-insensitive, like sortTable() in app.js
+    return series.str.lower()
+
+
+def _safe_name(value, taken):
+    name = re.sub(r'[\\/:*?"<>|\x00-\x1f]', "_", value).strip(" .") or "_none"
+    candidate, n = name, 1
+    while candidate.lower() in taken:
+        n += 1
+        candidate = f"{name}_{n}"
+    taken.add(candidate.lower())
+    return candidate
+
+
+class ShardWriter:
+    """Sink that builds sorted views and shards from DataFrame chunks."""
+
+    def __init__(self, out_dir, columns, version):
+        self.out_dir = out_dir
+        self.columns = list(columns)
+        self.version = version
+        self.views = sort_views(self.columns)
+        self.fields = [f for f in SHARD_FIELDS if f in self.columns]
+        if not self.fields:
+            raise ValueError(f"sharding needs one of the columns {SHARD_FIELDS}")
+        self.shards = {field: {} for field in self.fields}
+        self._names = {field: set() for field in self.fields}
+        self.rows = 0
+        for sub in ["sorted"] + [f"by_{field}" for field in self.fields]:
+            # Start clean so shards for values that no longer exist don't linger
+            path = os.path.join(out_dir, sub)
+            os.makedirs(path, exist_ok=True)
+            for name in os.listdir(path):
+                if name.endswith(".csv"):
+                    os.remove(os.path.join(path, name))
+
+    def _path(self, relpath):
+        return os.path.join(self.out_dir, relpath)
+
+    def write(self, df):
+        df = df[self.columns]
+        self.rows += len(df)
+        for field in self.fields:
+            for value, group in df.groupby(df[field].fillna("").astype(str), sort=False):
+                shard = self.shards[field].get(value)
+                if shard is None:
+                    name = _safe_name(value, self._names[field])
+                    shard = self.shards[field][value] = {"path": f"by_{field}/{name}.csv", "rows": 0}
+                    group.to_csv(self._path(shard["path"]), index=False)
+                else:
+                    group.to_csv(self._path(shard["path"]), mode="a", index=False, header=False)
+                shard["rows"] += len(group)
+
+    def _read(self, relpath):
+        return pd.read_csv(self._path(relpath), dtype=str, keep_default_na=False)
+
+    def _sort(self, df, view):
+        order, ascending = self.views[view]
+        return df.sort_values(order, ascending=ascending, key=_sort_key, kind="stable")
+
+    def _merge(self, paths, view, out_path):
+        # k-way merge of files that are each already sorted for this view
+        order, ascending = self.views[view]
+        index = [self.columns.index(c) for c in order]
+        files = [open(p, newline="", encoding="utf-8") for p in paths]
+        try:
+            readers = []
+            for f in files:
+                reader = csv.reader(f)
+                next(reader, None)
+                readers.append(reader)
+            with open(out_path, "w", newline="", encoding="utf-8") as out:
+                writer = csv.writer(out, lineterminator=os.linesep)
+                writer.writerow(self.columns)
+                writer.writerows(heapq.merge(
+                    *readers, key=lambda row: tuple(row[i].lower() for i in index), reverse=not ascending))
+        finally:
+            for f in files:
+                f.close()
+
+    def close(self):
+        default_view = next(iter(self.views))
+        for field in self.fields:
+            for shard in self.shards[field].values():
+                self._sort(self._read(shard["path"]), default_view).to_csv(self._path(shard["path"]), index=False)
+
+        # Shards of one field partition the catalogue, so merging them gives every row once
+        merge_field = self.fields[0]
+        for view in self.views:
+            out_path = self._path(f"sorted/{view}.csv")
+            shard_paths = [self._path(s["path"]) for s in self.shards[merge_field].values()]
+            if view == default_view:
+                self._merge(shard_paths, view, out_path)
+                continue
+            tmp_paths = []
+            try:
+                for i, path in enumerate(shard_paths):
+                    tmp = f"{out_path}.{i}.tmp"
+                    self._sort(pd.read_csv(path, dtype=str, keep_default_na=False), view).to_csv(tmp, index=False)
+                    tmp_paths.append(tmp)
+                self._merge(tmp_paths, view, out_path)
+            finally:
+                for tmp in tmp_paths:
+                    os.remove(tmp)
+
+        manifest = {
+            "version": self.version,
+            "columns": self.columns,
+            "rows": self.rows,
+            "default_view": default_view,
+            "views": {
+                view: {"path": f"sorted/{view}.csv", "order": order, "descending": not ascending}
+                for view, (order, ascending) in self.views.items()
+            },
+            "shards": self.shards,
+        }
+        with open(self._path("manifest.json"), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
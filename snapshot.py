@@ -0,0 +1,120 @@
+"""Typed columnar snapshot of model_list.csv (Arrow IPC or Parquet).
+
+Consumers can memory-map the snapshot and read only the columns they need
+instead of re-parsing the CSV and re-inferring types on every load.
+"""
+import pandas as pd
+
+from csv_reader import read_header
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+    import pyarrow.parquet as pq
+except ImportError:  # optional dependency, only needed for snapshots
+    pa = None
+
+# Column types for known headers; anything else is stored as a string
+COLUMN_TYPES = {
+    "context_length": "int64",
+    "parameter_count": "int64",
+    "cost_per_1k_tokens": "float64",
+    "release_date": "date",
+    "date": "date",
+    "source": "category",
+    "status": "category",
+    "ai_tab": "category",
+}
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("pyarrow is required for columnar snapshots: pip install pyarrow")
+
+
+def read_headers(path='model_list_headers.csv'):
+    return read_header(path)
+
+
+def schema_for(columns):
+    """Build the fixed Arrow schema for a list of column names."""
+    _require_pyarrow()
+    types = {
+        "int64": pa.int64(),
+        "float64": pa.float64(),
+        "date": pa.date32(),
+        # Stored as plain strings: the IPC file format allows one dictionary per field,
+        # which per-chunk encoding cannot guarantee. load_snapshot() re-encodes them.
+        "category": pa.string(),
+    }
+    return pa.schema([(c, types.get(COLUMN_TYPES.get(c), pa.string())) for c in columns])
+
+
+def _coerce(df, schema):
+    # Cast each column to its schema type; unparseable values become nulls
+    out = {}
+    for field in schema:
+        col = df[field.name] if field.name in df else pd.Series([None] * len(df), dtype=object)
+        kind = COLUMN_TYPES.get(field.name)
+        if kind == "int64":
+            col = pd.to_numeric(col, errors='coerce').astype("Int64")
+        elif kind == "float64":
+            col = pd.to_numeric(col, errors='coerce').astype("float64")
+        elif kind == "date":
+            col = pd.to_datetime(col, format='%Y-%m-%d', errors='coerce').dt.date
+        else:
+            col = col.astype(object).where(col.notna(), None)
+            col = col.map(lambda v: v if v is None else str(v))
+        out[field.name] = col
+    return pa.Table.from_pandas(pd.DataFrame(out), schema=schema, preserve_index=False)
+
+
+class SnapshotWriter:
+    """Write DataFrame chunks to a snapshot file; the format follows the suffix."""
+
+    def __init__(self, path, columns):
+        _require_pyarrow()
+        self.path = str(path)
+        self.schema = schema_for(columns)
+        if self.path.endswith('.parquet'):
+            self._writer = pq.ParquetWriter(self.path, self.schema)
+        else:
+            self._writer = ipc.new_file(self.path, self.schema)
+
+    def write(self, df):
+        self._writer.write_table(_coerce(df, self.schema))
+
+    def close(self):
+        self._writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_snapshot(df, path, columns=None):
+    with SnapshotWriter(path, columns or list(df.columns)) as writer:
+        writer.write(df)
+
+
+def load_snapshot(path, columns=None):
+    """Load a snapshot as a DataFrame, optionally only some columns.
+
+    Arrow IPC files are memory-mapped, so numeric columns without nulls are
+    handed to pandas without copying.
+    """
+    _require_pyarrow()
+    path = str(path)
+    if path.endswith('.parquet'):
+        table = pq.read_table(path, columns=columns, memory_map=True)
+    else:
+        # Leave the map open: the table's buffers point straight into it
+        table = ipc.open_file(pa.memory_map(path)).read_all()
+        if columns is not None:
+            table = table.select(columns)
+    for i, field in enumerate(table.schema):
+        if COLUMN_TYPES.get(field.name) == "category":
+            table = table.set_column(i, field.name, table.column(i).dictionary_encode())
+    return table.to_pandas(split_blocks=True, self_destruct=True)
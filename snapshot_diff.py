@@ -0,0 +1,256 @@
+"""Diff two snapshots of the catalogue: additions, removals, status flips and field changes.
+
+Both files are hash-joined on model_name (or --key). One pass over the old
+snapshot builds a hash index of key -> record number, plus an 8-byte hash
+of each row. The new snapshot is then streamed against the index. Only
+rows that differ are kept, and unchanged rows are dropped as soon as their
+hashes match. A final pass over the old file fetches the removed and
+changed rows. Time is linear in the size of both files. Memory is one
+small entry per old model plus the differences. Multi-million-row
+snapshots diff in seconds without either file being loaded whole.
+
+A changed row whose hash happens to equal the old row's is not detected
+and counts as unchanged. With 64-bit hashes that is about one missed
+change in 2**64 / n diffs of n rows.
+
+When a model has several rows (as in the event log), the one with the
+latest date and time is compared. Otherwise the last row in the file wins.
+
+    python snapshot_diff.py previous.csv model_list.csv -o changes.json
+    python snapshot_diff.py previous.csv model_list.csv --events new_events.csv
+    python snapshot_diff.py a.csv b.csv --key model_name,source
+"""
+import argparse
+import csv
+import json
+import sys
+from array import array
+from datetime import datetime
+from operator import itemgetter
+
+from asof import STAMP_FORMAT
+from csv_reader import iter_rows, read_header
+
+DEFAULT_KEY = ("model_name",)
+
+
+def snapshot_header(path, headers, key):
+    # Files written with a header use it; headerless ones (the event log) use the headers file
+    first = read_header(path)
+    if all(column in first for column in key):
+        return first, True
+    return read_header(headers), False
+
+
+def iter_records(path, header, has_header):
+    # (record number, row) for every well-formed data row
+    records = iter_rows(path)
+    if has_header:
+        next(records, None)
+    number = 0
+    for _, row in records:
+        if len(row) == len(header):
+            yield number, row
+            number += 1
+
+
+def _columns_function(header, names):
+    # row -> tuple of the named columns
+    cols = [header.index(name) for name in names]
+    if len(cols) == 1:
+        return lambda row, i=cols[0]: (row[i],)
+    return itemgetter(*cols) if cols else lambda row: ()
+
+
+def _key_function(header, key):
+    # A single key column is used as-is; composite keys become tuples
+    return itemgetter(*[header.index(name) for name in key])
+
+
+def _stamp_function(header):
+    # The event log's date and time order duplicate rows; other files use file order
+    names = [name for name in ("date", "time") if name in header]
+    return _columns_function(header, names) if names else None
+
+
+def _wins(stamp, current):
+    # Newest event wins, ties keep the earlier row; without stamps the last row wins
+    return current is None or stamp is None or stamp > current
+
+
+class SnapshotIndex:
+    """key -> record number of the row that represents it, plus one 8-byte hash per row."""
+
+    def __init__(self, path, header, has_header, key, compared):
+        self.path = path
+        self.header = header
+        self.has_header = has_header
+        key_of = _key_function(header, key)
+        stamp_of = _stamp_function(header)
+        values_of = _columns_function(header, compared)
+
+        positions = {}
+        hashes = array("q")
+        stamps = [] if stamp_of else None
+        for number, row in iter_records(path, header, has_header):
+            hashes.append(hash(values_of(row)))
+            k = key_of(row)
+            if stamp_of is None:
+                positions[k] = number
+                continue
+            stamp = stamp_of(row)
+            stamps.append(stamp)
+            previous = positions.get(k)
+            if previous is None or _wins(stamp, stamps[previous]):
+                positions[k] = number
+        self.positions = positions
+        self.hashes = hashes
+        self.rows = len(hashes)
+
+    def fetch(self, numbers):
+        """Second pass: {record number: row} for the wanted record numbers."""
+        wanted = set(numbers)
+        found = {}
+        if not wanted:
+            return found
+        for number, row in iter_records(self.path, self.header, self.has_header):
+            if number in wanted:
+                found[number] = row
+                if len(found) == len(wanted):
+                    break
+        return found
+
+
+def diff(old_path, new_path, headers="model_list_headers.csv", key=DEFAULT_KEY):
+    """Return the differences between two snapshots as a JSON-serialisable dict."""
+    key = list(key)
+    old_header, old_has_header = snapshot_header(old_path, headers, key)
+    new_header, new_has_header = snapshot_header(new_path, headers, key)
+    for path, header in ((old_path, old_header), (new_path, new_header)):
+        missing = [name for name in key if name not in header]
+        if missing:
+            raise ValueError(f"{path}: no {', '.join(missing)} column in {header}")
+    # Only columns present in both snapshots are compared
+    compared = [name for name in new_header if name in old_header and name not in key]
+    old = SnapshotIndex(old_path, old_header, old_has_header, key, compared)
+
+    # Stream the new snapshot against the old index. Per old row only the matching
+    # new record number is kept; full rows are kept only where they differ.
+    key_of = _key_function(new_header, key)
+    stamp_of = _stamp_function(new_header)
+    values_of = _columns_function(new_header, compared)
+    matched = array("q", [-1]) * old.rows
+    matched_stamp = {}
+    added = {}
+    changed = {}
+    new_rows = 0
+    for number, row in iter_records(new_path, new_header, new_has_header):
+        new_rows += 1
+        k = key_of(row)
+        stamp = stamp_of(row) if stamp_of else None
+        o = old.positions.get(k)
+        if o is None:
+            if k not in added or _wins(stamp, added[k][0]):
+                added[k] = (stamp, number, row)
+            continue
+        if matched[o] != -1 and not _wins(stamp, matched_stamp.get(o)):
+            continue
+        matched[o] = number
+        if stamp is not None:
+            matched_stamp[o] = stamp
+        if hash(values_of(row)) != old.hashes[o]:
+            changed[o] = row
+        else:
+            changed.pop(o, None)
+
+    removed = [o for o in old.positions.values() if matched[o] == -1]
+    old_rows = old.fetch(removed + list(changed))
+
+    result_changed, status_changes = [], []
+    old_col = {name: i for i, name in enumerate(old_header)}
+    new_col = {name: i for i, name in enumerate(new_header)}
+    for o in sorted(changed, key=matched.__getitem__):
+        before, after = old_rows[o], changed[o]
+        # Different hashes mean different values, so at least one field differs
+        fields = {name: {"old": before[old_col[name]], "new": after[new_col[name]]}
+                  for name in compared if before[old_col[name]] != after[new_col[name]]}
+        ident = {name: after[new_col[name]] for name in key}
+        if "status" in fields:
+            status_changes.append({**ident, "from": fields["status"]["old"], "to": fields["status"]["new"]})
+        result_changed.append({**ident, "fields": fields})
+
+    models = len(old.positions) - len(removed) + len(added)
+    result = {
+        "old": {"path": old_path, "rows": old.rows, "models": len(old.positions)},
+        "new": {"path": new_path, "rows": new_rows, "models": models},
+        "key": key,
+        "columns": {"added": [c for c in new_header if c not in old_header],
+                    "removed": [c for c in old_header if c not in new_header]},
+        "added": [dict(zip(new_header, row)) for _, _, row in sorted(added.values(), key=lambda a: a[1])],
+        "removed": [dict(zip(old_header, old_rows[o])) for o in sorted(removed)],
+        "status_changes": status_changes,
+        "changed": result_changed,
+    }
+    result["summary"] = {
+        "added": len(added),
+        "removed": len(removed),
+        "status_changes": len(status_changes),
+        "changed": len(result_changed),
+        "unchanged": models - len(added) - len(result_changed),
+    }
+    return result
+
+
+def event_rows(result, header, stamp):
+    """Added/Removed log rows in header order for the models added and removed."""
+    day, clock = stamp.split(" ")
+    rows = []
+    for status, models in (("Added", result["added"]), ("Removed", result["removed"])):
+        for model in models:
+            event = {"model_name": model.get("model_name", ""), "source": model.get("source", ""),
+                     "date": day, "time": clock, "status": status,
+                     "comments": model.get("comments", "") if status == "Added" else ""}
+            rows.append([event.get(column, "") for column in header])
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Diff two catalogue snapshots joined on model_name")
+    parser.add_argument("old")
+    parser.add_argument("new")
+    parser.add_argument("--headers", default="model_list_headers.csv",
+                        help="CSV whose first row is the header (used for files without one)")
+    parser.add_argument("--key", default=",".join(DEFAULT_KEY),
+                        help="comma-separated join columns (default: model_name)")
+    parser.add_argument("-o", "--output", help="write the diff as JSON here (default: stdout)")
+    parser.add_argument("--events", metavar="PATH",
+                        help="also write Added/Removed rows in the event log format (see --headers)")
+    parser.add_argument("--stamp", help=f"date and time for --events rows (default: now, {STAMP_FORMAT})")
+    args = parser.parse_args(argv)
+
+    try:
+        result = diff(args.old, args.new, args.headers, args.key.split(","))
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+            f.write("\n")
+    else:
+        json.dump(result, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+
+    if args.events:
+        stamp = args.stamp or datetime.now().strftime(STAMP_FORMAT)
+        with open(args.events, "w", newline="", encoding="utf-8") as f:
+            csv.writer(f, lineterminator="\n").writerows(event_rows(result, read_header(args.headers), stamp))
+
+    summary = result["summary"]
+    print(f"{summary['added']} added, {summary['removed']} removed, {summary['status_changes']} status "
+          f"change(s), {summary['changed']} changed, {summary['unchanged']} unchanged", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,211 @@
+"""SQLite backend for the catalogue, with model_list.csv exported from it.
+
+Rows live in one indexed `models` table, with a unique index on the key
+columns and plain indexes on model_name, source, status and (date, time).
+A refresh is an upsert: new keys are inserted and changed rows updated in
+place, all in one transaction with executemany. Unchanged rows are not
+touched, so nothing is rewritten unless it changed. The CSV is exported
+in insertion order for everything that still reads the flat file.
+
+    python sqlite_store.py import model_list.csv --db catalogue.db
+    python sqlite_store.py export catalogue.db -o model_list.csv
+    python sqlite_store.py query catalogue.db "SELECT source, count(*) FROM models GROUP BY source"
+"""
+import argparse
+import csv
+import sqlite3
+import sys
+from itertools import islice
+
+from csv_reader import iter_rows, read_header
+from validate_csv import duplicate_key_columns
+
+TABLE = "models"
+# SQLite column types for known headers; anything else is TEXT
+COLUMN_TYPES = {"context_length": "INTEGER", "parameter_count": "INTEGER", "cost_per_1k_tokens": "REAL"}
+INDEXED = [("model_name",), ("source",), ("status",), ("date", "time")]
+BATCH_ROWS = 50_000
+
+
+def _quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def table_layout(conn):
+    # (columns, key columns) of an existing table, or ([], []) for a new database
+    columns = [row[1] for row in conn.execute(f"PRAGMA table_info({TABLE})")]
+    keys = [row[2] for row in conn.execute(f"PRAGMA index_info({TABLE}_key)")]
+    return columns, keys
+
+
+class SQLiteStore:
+    """The catalogue table in an SQLite file; also usable as a script.py output sink."""
+
+    def __init__(self, path, columns, keys):
+        self.path = path
+        self.columns = list(columns)
+        self.keys = list(keys)
+        self.inserted = 0
+        self.updated = 0
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._create()
+
+    def _create(self):
+        existing, existing_keys = table_layout(self.conn)
+        if existing and existing != self.columns:
+            raise ValueError(f"{self.path}: table {TABLE} has columns {existing}, expected {self.columns}")
+        if existing_keys and existing_keys != self.keys:
+            raise ValueError(f"{self.path}: table {TABLE} is keyed on {existing_keys}, expected {self.keys}")
+        columns = ", ".join(f"{_quote(c)} {COLUMN_TYPES.get(c, 'TEXT')}" for c in self.columns)
+        with self.conn:
+            self.conn.execute(f"CREATE TABLE IF NOT EXISTS {TABLE} ({columns})")
+            self.conn.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS {TABLE}_key ON {TABLE} "
+                              f"({', '.join(map(_quote, self.keys))})")
+            for index in INDEXED:
+                if all(c in self.columns for c in index) and list(index) != self.keys:
+                    self.conn.execute(f"CREATE INDEX IF NOT EXISTS {TABLE}_{'_'.join(index)} ON {TABLE} "
+                                      f"({', '.join(map(_quote, index))})")
+
+    def count(self):
+        return self.conn.execute(f"SELECT count(*) FROM {TABLE}").fetchone()[0]
+
+    def _last_rowid(self):
+        # max(rowid) is one B-tree lookup, where count(*) scans the table
+        return self.conn.execute(f"SELECT max(rowid) FROM {TABLE}").fetchone()[0] or 0
+
+    def _upsert_sql(self):
+        names = ", ".join(map(_quote, self.columns))
+        values = [c for c in self.columns if c not in self.keys]
+        sql = (f"INSERT INTO {TABLE} ({names}) VALUES ({', '.join('?' * len(self.columns))}) "
+               f"ON CONFLICT ({', '.join(map(_quote, self.keys))}) ")
+        if not values:
+            return sql + "DO NOTHING"
+        # The WHERE clause leaves identical rows alone, so they are not counted as changes
+        return sql + (f"DO UPDATE SET {', '.join(f'{_quote(c)} = excluded.{_quote(c)}' for c in values)} "
+                      f"WHERE {' OR '.join(f'{_quote(c)} IS NOT excluded.{_quote(c)}' for c in values)}")
+
+    def upsert_rows(self, rows):
+        """Insert or update an iterable of row sequences in one transaction; returns (inserted, updated)."""
+        sql = self._upsert_sql()
+        # Nothing is deleted here, so every insert takes rowid max(rowid) + 1
+        before = self._last_rowid()
+        changes = self.conn.total_changes
+        rows = iter(rows)
+        with self.conn:
+            while True:
+                batch = list(islice(rows, BATCH_ROWS))
+                if not batch:
+                    break
+                self.conn.executemany(sql, batch)
+        inserted = self._last_rowid() - before
+        updated = self.conn.total_changes - changes - inserted
+        self.inserted += inserted
+        self.updated += updated
+        return inserted, updated
+
+    def bulk_load(self, rows):
+        """Replace the table contents; the fast path for a first import."""
+        rows = iter(rows)
+        sql = f"INSERT INTO {TABLE} VALUES ({', '.join('?' * len(self.columns))})"
+        with self.conn:
+            self.conn.execute(f"DELETE FROM {TABLE}")
+            while True:
+                batch = list(islice(rows, BATCH_ROWS))
+                if not batch:
+                    break
+                self.conn.executemany(sql, batch)
+        self.inserted = self.count()
+        return self.inserted
+
+    def write(self, df):
+        # Sink interface: upsert a DataFrame chunk, with NaN stored as NULL
+        frame = df[self.columns].astype(object).where(df[self.columns].notna(), None)
+        self.upsert_rows(frame.itertuples(index=False, name=None))
+
+    def iter_rows(self):
+        yield from self.conn.execute(f"SELECT {', '.join(map(_quote, self.columns))} FROM {TABLE} ORDER BY rowid")
+
+    def export_csv(self, path, header=True):
+        """Write the table to CSV in insertion order; returns the row count."""
+        rows = 0
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f, lineterminator="\n")
+            if header:
+                writer.writerow(self.columns)
+            for row in self.iter_rows():
+                writer.writerow(["" if value is None else value for value in row])
+                rows += 1
+        return rows
+
+    def query(self, sql, params=()):
+        return self.conn.execute(sql, params).fetchall()
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def open_store(db, columns=None):
+    # Columns and keys come from the existing table; a new table is keyed like validate_csv.py
+    conn = sqlite3.connect(db)
+    try:
+        existing, keys = table_layout(conn)
+    finally:
+        conn.close()
+    if columns is None:
+        if not existing:
+            raise ValueError(f"{db} has no {TABLE} table; import a CSV first")
+        columns = existing
+    return SQLiteStore(db, columns, keys or duplicate_key_columns(columns))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Keep the catalogue in SQLite and export it as CSV")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    load = commands.add_parser("import", help="upsert a CSV into the database")
+    load.add_argument("csv")
+    load.add_argument("--db", default="catalogue.db")
+    load.add_argument("--headers", default="model_list_headers.csv",
+                      help="CSV whose first row is the header (used when the file has none)")
+    load.add_argument("--replace", action="store_true", help="replace the table instead of upserting")
+
+    export = commands.add_parser("export", help="write the table as CSV")
+    export.add_argument("db")
+    export.add_argument("-o", "--output", default="model_list.csv")
+    export.add_argument("--no-header", action="store_true", help="omit the header row, like the published file")
+
+    query = commands.add_parser("query", help="run an SQL query and print the rows as CSV")
+    query.add_argument("db")
+    query.add_argument("sql")
+    args = parser.parse_args(argv)
+
+    if args.command == "import":
+        header = read_header(args.headers)
+        skip = 1 if read_header(args.csv) == header else 0
+        rows = (row for _, row in islice(iter_rows(args.csv), skip, None))
+        with open_store(args.db, header) as store:
+            if args.replace:
+                print(f"{store.bulk_load(rows)} rows loaded into {args.db}")
+            else:
+                inserted, updated = store.upsert_rows(rows)
+                print(f"{inserted} inserted, {updated} updated, {store.count()} rows in {args.db}")
+    elif args.command == "export":
+        with open_store(args.db) as store:
+            rows = store.export_csv(args.output, header=not args.no_header)
+        print(f"{rows} rows written to {args.output}")
+    else:
+        with open_store(args.db) as store:
+            csv.writer(sys.stdout, lineterminator="\n").writerows(store.query(args.sql))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+"""Precomputed dashboard aggregates (stats.json) for model_list.csv.
+
+Computes the numbers app.js shows in updateStatistics() and
+renderProviderTags() once at build time, so the browser can paint them
+without scanning every row.
+"""
+import json
+
+import pandas as pd
+
+from providers import classify_providers
+
+
+class StatsBuilder:
+    """Accumulate aggregates over DataFrame chunks and write them as JSON."""
+
+    def __init__(self, path, version):
+        self.path = path
+        self.version = version
+        self.total = 0
+        self.cost_sum = 0.0
+        self.priced = 0
+        self.counts = {}
+
+    def _count(self, key, values):
+        counts = values.fillna("").astype(str).value_counts()
+        if key in self.counts:
+            counts = self.counts[key].add(counts, fill_value=0)
+        self.counts[key] = counts
+
+    def write(self, df):
+        self.total += len(df)
+        for key in ("source", "status"):
+            if key in df:
+                self._count(key, df[key])
+        self._count("provider", df["ai_tab"] if "ai_tab" in df else classify_providers(df))
+        if "cost_per_1k_tokens" in df:
+            # Unknown prices are left out of the average rather than counted as zero
+            cost = pd.to_numeric(df["cost_per_1k_tokens"], errors="coerce")
+            self.cost_sum += float(cost.sum())
+            self.priced += int(cost.notna().sum())
+
+    def result(self):
+        by = {key: {name: int(n) for name, n in counts.sort_index().items()}
+              for key, counts in self.counts.items()}
+        by_source = by.get("source", {})
+        return {
+            "version": self.version,
+            "total": self.total,
+            "available": by.get("status", {}).get("Available", 0),
+            "avg_cost": self.cost_sum / self.priced if self.priced else None,
+            "priced": self.priced,
+            "top_source": max(by_source, key=by_source.get) if by_source else "-",
+            "by_source": by_source,
+            "by_status": by.get("status", {}),
+            "by_provider": by.get("provider", {}),
+        }
+
+    def close(self):
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(self.result(), f, separators=(",", ":"))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if exc[0] is None:
+            self.close()
+
+
+def write_stats(df, path, version):
+    with StatsBuilder(path, version) as builder:
+        builder.write(df)
@@ -0,0 +1,117 @@
+"""Synthetic catalogues in the model_list.csv schemas, for testing and benchmarks.
+
+Two schemas are supported:
+
+    catalogue  the columns script.py writes (model_name, status, source, ...)
+    events     the published change log (model_name, source, date, time, status, comments)
+
+Records are generated lazily from a seeded RNG, so any size can be streamed
+and the same seed always gives the same rows.
+
+    python synthetic.py 100000 --schema events -o synthetic.csv
+"""
+import argparse
+import csv
+import random
+import sys
+from datetime import date, datetime, timedelta
+
+SCHEMAS = {
+    "catalogue": ["model_name", "status", "source", "release_date", "parameters",
+                  "context_length", "cost_per_1k_tokens"],
+    "events": ["model_name", "source", "date", "time", "status", "comments"],
+}
+
+FAMILIES = [
+    ("gpt", "OpenAI"), ("claude", "Anthropic"), ("gemini", "Google"), ("llama", "Meta"),
+    ("mistral", "Mistral"), ("command", "Cohere"), ("deepseek", "DeepSeek"), ("yi", "01.AI"),
+    ("qwen", "Alibaba"), ("grok", "xAI"), ("phi", "Microsoft"), ("glm", "Zhipu"),
+]
+VARIANTS = ["", "-mini", "-pro", "-flash", "-turbo", "-instruct", "-preview", "-exp"]
+STATUSES = ["Available", "Available", "Available", "Limited Access", "Deprecated", "Beta"]
+PARAMETERS = ["Unknown", "Unknown", "7B", "13B", "34B", "46.7B", "70B", "104B", "175B", "540B", "1.76T"]
+CONTEXT_LENGTHS = [4096, 8192, 16385, 32000, 128000, 200000, 1000000]
+FEEDS = ["Arena Models", "New Arena Models", "Gemini Models", "OpenAI Models",
+         "Discovery Tool", "Internal Models"]
+COMMENTS = ["", "", "", "No description provided", "Preview release", "Stable release"]
+
+START_DATE = date(2022, 1, 1)
+
+
+def _model_name(rng, i):
+    family, provider = rng.choice(FAMILIES)
+    return f"{family}-{rng.randint(1, 5)}.{rng.randint(0, 9)}{rng.choice(VARIANTS)}-{i:x}", provider
+
+
+def generate_catalogue(n, seed=0):
+    rng = random.Random(seed)
+    for i in range(n):
+        name, provider = _model_name(rng, i)
+        yield {
+            "model_name": name,
+            "status": rng.choice(STATUSES),
+            "source": provider,
+            "release_date": (START_DATE + timedelta(days=rng.randrange(1500))).isoformat(),
+            "parameters": rng.choice(PARAMETERS),
+            "context_length": rng.choice(CONTEXT_LENGTHS),
+            "cost_per_1k_tokens": round(rng.uniform(0.0001, 0.06), 5),
+        }
+
+
+def generate_events(n, seed=0):
+    # A change log: mostly additions, with some later removals of earlier models
+    rng = random.Random(seed)
+    stamp = datetime(2024, 1, 1)
+    live = []
+    for i in range(n):
+        stamp += timedelta(seconds=rng.randrange(1, 600))
+        if live and rng.random() < 0.3:
+            name, feed = live.pop(rng.randrange(len(live)))
+            status, comment = "Removed", ""
+        else:
+            name, provider = _model_name(rng, i)
+            feed = rng.choice(FEEDS)
+            live.append((name, feed))
+            status = "Added"
+            comment = (f"ID: {name}; Provider: {provider}" if feed == "Discovery Tool"
+                       else rng.choice(COMMENTS))
+        yield {
+            "model_name": name,
+            "source": feed,
+            "date": stamp.strftime("%Y-%m-%d"),
+            "time": stamp.strftime("%H:%M:%S"),
+            "status": status,
+            "comments": comment,
+        }
+
+
+def generate(n, schema="catalogue", seed=0):
+    if schema not in SCHEMAS:
+        raise ValueError(f"unknown schema {schema!r}, expected one of {sorted(SCHEMAS)}")
+    return generate_catalogue(n, seed) if schema == "catalogue" else generate_events(n, seed)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic model_list.csv")
+    parser.add_argument("rows", type=int)
+    parser.add_argument("--schema", choices=sorted(SCHEMAS), default="catalogue")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-header", action="store_true",
+                        help="omit the header row, like the published events file")
+    parser.add_argument("-o", "--output", help="output path (default: stdout)")
+    args = parser.parse_args(argv)
+
+    out = open(args.output, "w", newline="", encoding="utf-8") if args.output else sys.stdout
+    try:
+        writer = csv.DictWriter(out, fieldnames=SCHEMAS[args.schema], lineterminator="\n")
+        if not args.no_header:
+            writer.writeheader()
+        writer.writerows(generate(args.rows, args.schema, args.seed))
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+import zlib
+
+import pytest
+
+from csv_reader import read_frame
+from search_index import SearchIndexBuilder, search_text
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+HEADER = "model_name,source,date,time,status,comments\n"
+# Headerless and newest first, like the published model_list.csv
+EVENT_LOG = """\
+gpt-4o-mini,Arena Models,2025-06-14,09:12:00,Added,"cheap, fast"
+claude-3-haiku,Internal Models,2025-06-13,18:40:00,Removed,
+gemini-1.5-pro-001,Gemini Models,2025-06-12,23:18:00,Removed,
+stephen-code,Discovery Tool,2025-06-11,07:57:00,Added,Straße naïve
+mystery-model,Discovery Tool,2025-06-10,12:00:00,Added,
+claude-3-haiku,Internal Models,2025-06-09,10:30:00,Added,
+"""
+
+# Loads the rows and the index the way the dashboard does, and reports what it could match
+DASHBOARD = """
+const fs = require('fs');
+global.document = { addEventListener() {} };
+global.window = {};
+const m = new module.constructor();
+m._compile(fs.readFileSync(process.argv[1], 'utf8') + '\\nmodule.exports = AIModelsDashboard;', 'app.js');
+const d = Object.create(m.exports.prototype);
+d.providers = new Set();
+d.varintDigits = new Map([...'0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz-_']
+    .map((char, digit) => [char, digit]));
+d.models = d.parseCSV(fs.readFileSync(process.argv[2], 'utf8'));
+d.processModels();
+d.prepareSearchIndex(JSON.parse(fs.readFileSync(process.argv[3], 'utf8')));
+console.log(JSON.stringify({
+    rows: d.models.length,
+    unindexed: d.searchIndex.unindexed.length,
+    found: ['claude', 'straße', 'cheap, f', 'gemini'].map(term => d.searchWithIndex(term).length)
+}));
+"""
+
+
+@pytest.fixture
+def event_log(tmp_path):
+    (tmp_path / "model_list.csv").write_text(EVENT_LOG, encoding="utf-8")
+    (tmp_path / "model_list_headers.csv").write_text(HEADER, encoding="utf-8")
+    (tmp_path / "last-updated.txt").write_text("2025-06-14 09:12:00", encoding="utf-8")
+    return tmp_path
+
+
+def dashboard(csv_path, index_path):
+    if shutil.which("node") is None:
+        pytest.skip("node is not installed")
+    out = subprocess.run(["node", "-e", DASHBOARD, os.path.join(ROOT, "app.js"), str(csv_path), str(index_path)],
+                         check=True, capture_output=True, text=True)
+    return json.loads(out.stdout)
+
+
+def test_missing_ai_tab_is_classified(event_log):
+    df = read_frame(event_log / "model_list.csv", HEADER.strip().split(","))
+    assert "ai_tab" not in df
+    builder = SearchIndexBuilder(event_log / "search_index.json", "v")
+    builder.write(df)
+    texts = search_text(df)
+    assert texts[0] == "gpt-4o-mini arena models gpt added  cheap, fast"
+    assert texts[4].startswith("mystery-model discovery tool discovery tool ")  # falls back to the source
+    assert builder.result()["keys"] == [zlib.crc32(t.encode("utf-8")) for t in texts.unique()]
+
+
+def test_deploy_outputs_match_dashboard(event_log):
+    # What deploy.yml runs, then the default view the dashboard loads
+    subprocess.run([sys.executable, os.path.join(ROOT, "script.py"), "--outputs-only", "--shards", "--search-index"],
+                   cwd=event_log, check=True, capture_output=True)
+    result = dashboard(event_log / "shards" / "sorted" / "date.csv", event_log / "search_index.json")
+    assert result == {"rows": 6, "unindexed": 0, "found": [2, 1, 1, 1]}
+
+
+def test_headerless_log_index_matches_dashboard(event_log):
+    # Built straight from the log, without ai_tab; the dashboard fills it in on its side
+    df = read_frame(event_log / "model_list.csv", HEADER.strip().split(","))
+    builder = SearchIndexBuilder(event_log / "search_index.json", "v")
+    builder.write(df)
+    builder.close()
+    df.to_csv(event_log / "rows.csv", index=False)
+    result = dashboard(event_log / "rows.csv", event_log / "search_index.json")
+    assert result == {"rows": 6, "unindexed": 0, "found": [2, 1, 1, 1]}
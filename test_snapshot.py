@@ -0,0 +1,29 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from csv_reader import read_frame
+from snapshot import load_snapshot
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+@pytest.mark.parametrize("name", ["s.arrow", "s.parquet"])
+def test_multi_chunk_snapshot_round_trips(tmp_path, name):
+    # Many small chunks, each with its own mix of sources and statuses
+    subprocess.run([sys.executable, os.path.join(ROOT, "script.py"), "--synthetic", "40", "--stream",
+                    "--chunk-size", "3", "--snapshot", name],
+                   cwd=tmp_path, check=True, capture_output=True)
+    csv = read_frame(tmp_path / "model_list.csv")
+    snap = load_snapshot(tmp_path / name)
+
+    assert list(snap.columns) == list(csv.columns)
+    assert len(snap) == len(csv) == 40
+    for column in ("model_name", "source", "status", "ai_tab"):
+        assert snap[column].astype(str).tolist() == csv[column].tolist()
+    assert snap["source"].dtype == "category"
+    assert snap["context_length"].tolist() == csv["context_length"].astype(int).tolist()
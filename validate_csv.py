@@ -0,0 +1,120 @@
+"""Validate model_list.csv against model_list_headers.csv in one streaming pass.
+
+Checks every row for column count, quoting, ISO dates and times, allowed
+status values, empty model names and duplicate keys, and reports every
+problem with its line number. Only the standard library is used so CI can
+run it without installing anything.
+
+    python validate_csv.py model_list.csv --headers model_list_headers.csv
+"""
+import argparse
+import re
+import sys
+from datetime import date, time
+
+from csv_reader import iter_rows, read_header
+
+ALLOWED_STATUSES = {"Added", "Removed", "Available", "Limited Access", "Deprecated", "Beta"}
+DATE_COLUMNS = ("date", "release_date")
+TIME_COLUMNS = ("time",)
+DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+TIME_RE = re.compile(r"\d{2}:\d{2}(:\d{2})?")
+
+
+def duplicate_key_columns(header):
+    # The same model can legitimately appear once per feed and per event time
+    return [c for c in ("model_name", "source", "date", "time") if c in header]
+
+
+def _valid_date(value):
+    if not DATE_RE.fullmatch(value):
+        return False
+    try:
+        date.fromisoformat(value)
+    except ValueError:
+        return False
+    return True
+
+
+def _valid_time(value):
+    if not TIME_RE.fullmatch(value):
+        return False
+    try:
+        time.fromisoformat(value)
+    except ValueError:
+        return False
+    return True
+
+
+def validate(path, header):
+    """Yield (line, message) for every problem found in the CSV at path."""
+    width = len(header)
+    column = {name: i for i, name in enumerate(header)}
+    date_cols = [(name, column[name]) for name in DATE_COLUMNS if name in column]
+    time_cols = [(name, column[name]) for name in TIME_COLUMNS if name in column]
+    status_col = column.get("status")
+    name_col = column.get("model_name")
+    key_cols = [column[name] for name in duplicate_key_columns(header)]
+    seen = {}
+
+    # Quoting errors are reported through the callback, then emitted in line order
+    problems = []
+    first = True
+    for line, row in iter_rows(path, on_error=lambda line, msg: problems.append((line, f"malformed quoting: {msg}"))):
+        yield from problems
+        problems.clear()
+
+        if first:
+            first = False
+            # model_list.csv is normally headerless, but a header row is allowed
+            if row == header:
+                continue
+        if not row:
+            yield line, "empty line"
+            continue
+        if len(row) != width:
+            yield line, f"expected {width} columns, found {len(row)}"
+            continue
+
+        if name_col is not None and not row[name_col].strip():
+            yield line, "empty model_name"
+        for name, i in date_cols:
+            if not _valid_date(row[i]):
+                yield line, f"invalid date {row[i]!r} in column {name} (expected YYYY-MM-DD)"
+        for name, i in time_cols:
+            if not _valid_time(row[i]):
+                yield line, f"invalid time {row[i]!r} in column {name} (expected HH:MM:SS)"
+        if status_col is not None and row[status_col] not in ALLOWED_STATUSES:
+            yield line, f"unknown status {row[status_col]!r}"
+
+        if key_cols:
+            key = tuple(row[i] for i in key_cols)
+            if key in seen:
+                yield line, f"duplicate key {key} (first seen on line {seen[key]})"
+            else:
+                seen[key] = line
+    yield from problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Validate model_list.csv against its header spec")
+    parser.add_argument("csv", nargs="?", default="model_list.csv")
+    parser.add_argument("--headers", default="model_list_headers.csv",
+                        help="CSV whose first row is the expected header")
+    args = parser.parse_args(argv)
+
+    header = read_header(args.headers)
+    errors = 0
+    for line, message in validate(args.csv, header):
+        print(f"{args.csv}:{line}: {message}")
+        errors += 1
+
+    if errors:
+        print(f"{errors} error(s) found in {args.csv}")
+        return 1
+    print(f"{args.csv} is valid ({', '.join(header)})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())